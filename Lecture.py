@@ -6,7 +6,7 @@ class Course:
 
     courseCodeSeed = 100
 
-    def __init__(self, name, corp, credit, hpw):
+    def __init__(self, name, corp, credit, hpw, labs_per_week=0, code=None):
         self.department = "Computer Science"
         self.courseinitials = "CP"
         self.course_name = name
@@ -14,8 +14,9 @@ class Course:
         self.credit = credit
         self.hpw = hpw
         
-        self.code = self.generateCourceCode()
-        self.hasLab = True
+        self.code = code if code is not None else self.generateCourceCode()
+        self.labs_per_week = labs_per_week
+        self.hasLab = labs_per_week > 0
 
     def show_info(self):
         print(f"Course Name: {self.course_name}")
@@ -23,6 +24,7 @@ class Course:
         print(f"Credit: {self.credit}")
         print(f"Code: {self.code}")
         print(f"Hours per week: {self.hpw}")
+        print(f"Labs per week: {self.labs_per_week}")
 
     def get_info(self, infoname):
 
@@ -53,16 +55,24 @@ class Lecture(Course):
         credit,
         professor,
         hpw,
+        labs_per_week=0,
+        room=None,
+        code=None,
     ):
-        super().__init__(name, corp, credit, hpw)
+        super().__init__(name, corp, credit, hpw, labs_per_week, code)
         self.professor = professor
+        self.room = room
 
     def show_info(self):
         super().show_info()
         print(f"Professor: {self.professor}")
+        if self.room:
+            print(f"Room: {self.room}")
 
     def get_info(self, infoname):
         if infoname == "professor":
             return self.professor
+        elif infoname == "room":
+            return self.room
         else:
             return super().get_info(infoname)
@@ -1,41 +1,30 @@
-from datetime import timedelta
-from prettytable import PrettyTable
-from Lecture import Lecture
-import tkinter as tk
-from tkinter import ttk
+import argparse
 import json
-import openpyxl
-from openpyxl.styles import Alignment, Font
-
-def time_to_minutes(t):
-    """Convert HH:MM time string to minutes."""
-    return int(t.split(":")[0]) * 60 + int(t.split(":")[1])
-
-
-def minutes_to_time(m):
-    """Convert minutes back to HH:MM format."""
-    return f"{m // 60:02d}:{m % 60:02d}"
-
-
-def load_config():
-    """Load class and break configurations from JSON files."""
-    with open("class.config.json") as f:
-        class_config = json.load(f)
-    with open("break.config.json") as f:
-        break_config = json.load(f)
-    return class_config, break_config
+import logging
+import os
+import subprocess
+import sys
+from contextlib import nullcontext
+from Lecture import Lecture
+from capacity import InfeasibleScheduleError, check_capacity
+from config import load_config, parse_break_times, time_to_minutes
+from constraint_spec import apply_to_greedy, compile_masks, load_constraints
+from day_selection import DayLoadHeap
+from instrumentation import SchedulerMetrics, record_probes
+from occupancy import DayOccupancy, ResourceIndex, interval_mask
+from placement import Schedule, minutes_to_time
+from slots import build_slot_grid
+from labs import place_labs
+from optimizer import improve_schedule
+from schedule_cache import ScheduleCache, cache_key
 
+# prettytable, tkinter and openpyxl are imported inside the functions that
+# use them, so computing a schedule only needs the standard library
 
-def parse_break_times(break_config):
-    """Convert break times to minutes."""
-    breaks = []
-    for break_type in break_config["Breaks"]:
-        for timing in break_config["Breaks"][break_type]["timeing"]:
-            start_time, end_time = timing.split("-")
-            breaks.append((time_to_minutes(start_time), time_to_minutes(end_time)))
+# Rows added to the GUI table each time the view scrolls near its end
+GUI_CHUNK_ROWS = 200
 
-    print(breaks)
-    return breaks
+logger = logging.getLogger(__name__)
 
 
 def is_time_available(start_time, duration, day_schedule, breaks, class_end_time):
@@ -47,100 +36,293 @@ def is_time_available(start_time, duration, day_schedule, breaks, class_end_time
         if not (end_time <= break_start or start_time >= break_end):
             return False
     for lecture in day_schedule:
-        lec_start, lec_end = map(time_to_minutes, lecture["Time"].split("-"))
-        if not (end_time <= lec_start or start_time >= lec_end):
+        if not (end_time <= lecture.start or start_time >= lecture.end):
             return False
     return True
 
 
+def build_day_occupancy(days, breaks, class_start_time, class_end_time):
+    """Create an occupancy index for every day with the breaks already taken."""
+    occupancy = {}
+    for day in days:
+        occupancy[day] = DayOccupancy(class_end_time)
+        occupancy[day].reserve(0, class_start_time)
+        for break_start, break_end in breaks:
+            occupancy[day].reserve(break_start, break_end)
+    return occupancy
+
+
 def add_breaks_to_schedule(schedule, breaks):
     """Add break times to the schedule."""
     for day in schedule:
         for break_start, break_end in breaks:
-            schedule[day].append(
-                {
-                    "Course Name": "Break",
-                    "Time": f"{minutes_to_time(break_start)}-{minutes_to_time(break_end)}",
-                    "Professor Name": "",
-                    "Corp": "Break",
-                }
+            schedule.add(
+                day, break_start, break_end, "Break", "", "Break", kind="break"
             )
 
 
-def create_schedule(lectures, class_config, break_config):
-    """Generate a weekly schedule based on class and break configurations."""
+def create_schedule(
+    lectures,
+    class_config,
+    break_config,
+    grid=None,
+    resources=None,
+    metrics=None,
+    strict=True,
+    backend="bitmask",
+    constraints=None,
+    day_strategy="round_robin",
+):
+    """Generate a weekly schedule based on class and break configurations.
+
+    Pass the same `resources` index to every call that schedules a section of
+    the same institution so professors and rooms are never double-booked, and
+    a SchedulerMetrics as `metrics` to count probes, rejections and timings.
+
+    With `strict` the lectures are checked against the slot grid first and
+    InfeasibleScheduleError is raised if they can never fit. Hours that still
+    find no slot (e.g. because professors are busy) are listed in the
+    returned schedule's `unplaced`.
+
+    `backend` picks how free slots are found: "bitmask" scans minute masks
+    one query at a time, "numpy" asks a ConflictMatrix once per lecture for
+    every legal start of the week (needs numpy). Both give the same schedule.
+
+    `constraints` are rules from constraint_spec.load_constraints(); they are
+    compiled into the occupancy and resource masks before placement starts.
+
+    MAX_LECTURES_PER_DAY limits the lectures of the whole section on one day
+    and MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY those of one course; labs count
+    towards neither.
+
+    `day_strategy` "round_robin" walks the days in turn from WEEK_START_DAY
+    with one cursor shared by all lectures. "load" puts every hour on the day
+    with the most free slots left where the course is still under its daily
+    cap, which spreads the week evenly whatever the order of `lectures`.
+    """
     # Initialize schedule for each day
-    schedule = {day: [] for day in class_config["DAYS"]}
+    schedule = Schedule(class_config["DAYS"])
 
     # Parse config values
     class_start_time = time_to_minutes(class_config["START_TIME"])
     class_end_time = time_to_minutes(class_config["END_TIME"])
-    lecture_duration = class_config["LECTURE_DURATION"]
     max_lectures_per_day = class_config["MAX_LECTURES_PER_DAY"]
     max_same_lecture_count = class_config["MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY"]
-    gap_between_lectures = break_config["GAP_TIME_BETWEEN_LECTURES"]
     breaks = parse_break_times(break_config)
-
-    print(breaks)
+    if grid is None:
+        grid = build_slot_grid(class_config, break_config)
+    if strict:
+        check_capacity(lectures, class_config, grid)
+
+    logger.debug("Breaks: %s", breaks)
+    break_mask = 0
+    if metrics is not None:
+        for break_start, break_end in breaks:
+            break_mask |= interval_mask(break_start, break_end)
 
     days = class_config["DAYS"]
     current_day_index = days.index(class_config["WEEK_START_DAY"])
+    occupancy = build_day_occupancy(
+        days, breaks, class_start_time, class_end_time
+    )
+    if constraints:
+        if resources is None:
+            resources = ResourceIndex()
+        apply_to_greedy(compile_masks(constraints, days), occupancy, resources)
+
+    # Labs go first so the long blocks get the gaps that fit them best
+    with nullcontext() if metrics is None else metrics.span("labs"):
+        unplaced_labs = place_labs(lectures, schedule, occupancy, grid, resources)
+    for course_name, count in unplaced_labs.items():
+        schedule.unplaced.append(
+            {"course": course_name, "kind": "lab", "count": count}
+        )
 
-    def add_lecture(day, course_name, professor_name, start_time, end_time):
-        """Helper to add a lecture to the schedule for a specific day."""
-        schedule[day].append(
+    matrix = None
+    if backend == "numpy":
+        from conflicts import ConflictMatrix, first_legal
+
+        matrix = ConflictMatrix.from_state(
+            grid,
+            occupancy,
+            resources,
+            {lecture.professor for lecture in lectures},
+            {getattr(lecture, "room", None) for lecture in lectures},
+        )
+    elif backend != "bitmask":
+        raise ValueError(f"Unknown backend {backend!r}")
+
+    loads = None
+    if day_strategy == "load":
+        # First slot of each day the section has not filled yet; nothing
+        # before it needs probing
+        first_open = dict.fromkeys(days, 0)
+        # A day's capacity is its free slots, but never more lectures than
+        # MAX_LECTURES_PER_DAY, so a day at the limit is never picked
+        loads = DayLoadHeap(
+            days,
             {
-                "Course Name": course_name,
-                "Time": f"{minutes_to_time(start_time)}-{minutes_to_time(end_time)}",
-                "Professor Name": professor_name,
-                "Corp": course_name,
-            }
+                day: min(
+                    max_lectures_per_day,
+                    sum(
+                        1
+                        for start, end in grid.slots["lecture"][day]
+                        if occupancy[day].is_free(start, end)
+                    ),
+                )
+                for day in days
+            },
         )
+    elif day_strategy != "round_robin":
+        raise ValueError(f"Unknown day strategy {day_strategy!r}")
 
-    for lecture in lectures:
-        course_name = lecture.course_name
-        professor_name = lecture.professor
-        total_lectures = lecture.hpw
-        same_lecture_count = 0  # Track how many consecutive lectures of the same course
-
-        while total_lectures > 0:
-            day = days[current_day_index]
-            current_time = class_start_time
-            lectures_today = 0
-
-            while lectures_today < max_lectures_per_day and total_lectures > 0:
-                if same_lecture_count < max_same_lecture_count:
-                    if is_time_available(
-                        current_time,
-                        lecture_duration,
-                        schedule[day],
-                        breaks,
-                        class_end_time,
-                    ):
-                        end_time = current_time + lecture_duration
-                        add_lecture(
-                            day, course_name, professor_name, current_time, end_time
-                        )
-                        current_time = end_time + gap_between_lectures
-                        lectures_today += 1
-                        same_lecture_count += 1
-                        total_lectures -= 1
-                    else:
-                        current_time += 5  # Skip 5 minutes if time slot not available
-                else:
-                    # Reset count after max same lectures and move to the next day
-                    same_lecture_count = 0
-                    current_day_index = (current_day_index + 1) % len(days)
-                    break
+    # Lectures of the section on each day, checked against MAX_LECTURES_PER_DAY
+    day_lectures = dict.fromkeys(days, 0)
 
-                # Move to the next day if the current day is fully scheduled or time runs out
-                if (
-                    current_time >= class_end_time
-                    or lectures_today >= max_lectures_per_day
-                ):
-                    current_day_index = (current_day_index + 1) % len(days)
-                    current_time = class_start_time
-                    same_lecture_count = 0
+    def add_lecture(day, course_name, professor_name, room, start_time, end_time):
+        """Helper to add a lecture to the schedule for a specific day."""
+        day_lectures[day] += 1
+        occupancy[day].reserve(start_time, end_time)
+        if resources is not None:
+            resources.reserve(day, start_time, end_time, professor_name, room)
+        if matrix is not None:
+            matrix.reserve(day, start_time, end_time, professor_name, room)
+            legal[matrix.day_index[day]] &= ~matrix.overlapping(
+                day, start_time, end_time
+            )
+        schedule.add(
+            day,
+            start_time,
+            end_time,
+            course_name,
+            professor_name,
+            course_name,
+            room=room,
+        )
+        if metrics is not None:
+            metrics.place(day, start_time, end_time, course_name)
+
+    def find_slot(day, first):
+        """Jump straight to the next slot where the section, the professor
+        and the room are all free."""
+        taken = 0
+        if resources is not None:
+            taken = resources.mask(day, professor_name, room)
+        if matrix is None:
+            slot = grid.next_free_slot(day, first, occupancy[day], extra_busy=taken)
+        else:
+            slot = first_legal(legal, matrix.day_index[day], first)
+        if metrics is not None:
+            record_probes(
+                metrics, grid, day, first, slot, occupancy[day], break_mask, taken
+            )
+        return slot
+
+    def report_unplaced(course_name, count):
+        schedule.unplaced.append(
+            {"course": course_name, "kind": "lecture", "count": count}
+        )
+        logger.warning("Could not place %d hour(s) of %s", count, course_name)
+
+    def next_day():
+        """Index of the day after the current one."""
+        following = (current_day_index + 1) % len(days)
+        if metrics is not None:
+            metrics.rollover(days[current_day_index], days[following])
+        return following
+
+    lecture_span = nullcontext() if metrics is None else metrics.span("lectures")
+    with lecture_span:
+        for lecture in lectures:
+            course_name = lecture.course_name
+            professor_name = lecture.professor
+            room = getattr(lecture, "room", None)
+            total_lectures = lecture.hpw
+            # Day visits in a row that placed nothing; a whole week of them means
+            # no day will ever take the rest of this lecture's hours
+            fruitless_days = 0
+            if metrics is not None:
+                metrics.start_lecture(course_name)
+            if matrix is not None:
+                # Every start this lecture could take, in one vectorised query;
+                # only its own placements change it while it is being placed
+                legal = matrix.legal_starts([professor_name], [room])[0]
+            # Hours of this course placed on each day, kept across every visit
+            # to a day so the daily cap still holds once the week wraps around
+            on_day = {}
+
+            if loads is not None:
+                # Days that reached the daily cap for this course or had no slot
+                # this professor and room could use
+                excluded = set()
+                while total_lectures > 0:
+                    day = loads.best(excluded)
+                    if day is None:
+                        break
+                    slot = find_slot(day, first_open[day])
+                    if slot is None:
+                        excluded.add(day)
+                        continue
+                    start_time, end_time = grid.slot(day, slot)
+                    add_lecture(
+                        day, course_name, professor_name, room, start_time, end_time
+                    )
+                    loads.take(day)
+                    if slot == first_open[day]:
+                        following = grid.next_free_slot(day, slot, occupancy[day])
+                        if following is None:
+                            following = grid.slot_count(day)
+                        first_open[day] = following
+                    total_lectures -= 1
+                    on_day[day] = on_day.get(day, 0) + 1
+                    if on_day[day] >= max_same_lecture_count:
+                        if metrics is not None:
+                            metrics.reject("same_lecture_cap", day)
+                        excluded.add(day)
+                if total_lectures:
+                    report_unplaced(course_name, total_lectures)
+                    total_lectures = 0
+
+            while total_lectures > 0:
+                if fruitless_days >= len(days):
+                    report_unplaced(course_name, total_lectures)
+                    break
+                day = days[current_day_index]
+                current_slot = 0
+                fruitless_days += 1
+
+                while total_lectures > 0:
+                    if day_lectures[day] >= max_lectures_per_day:
+                        # The section is at its daily limit; move to the next day
+                        if metrics is not None:
+                            metrics.reject("daily_limit", day)
+                        current_day_index = next_day()
+                        break
+                    if on_day.get(day, 0) >= max_same_lecture_count:
+                        # The course is at its daily cap here; move to the next day
+                        if metrics is not None:
+                            metrics.reject("same_lecture_cap", day)
+                        current_day_index = next_day()
+                        break
+                    slot = find_slot(day, current_slot)
+                    if slot is None:
+                        current_day_index = next_day()  # Nothing fits today
+                        break
+                    start_time, end_time = grid.slot(day, slot)
+                    add_lecture(
+                        day, course_name, professor_name, room, start_time, end_time
+                    )
+                    current_slot = slot + 1
+                    fruitless_days = 0
+                    on_day[day] = on_day.get(day, 0) + 1
+                    total_lectures -= 1
+
+                    # Move to the next day if the current day is fully scheduled
+                    if current_slot >= grid.slot_count(day):
+                        current_day_index = next_day()
+                        break
+            if metrics is not None:
+                metrics.finish_lecture()
 
     # Add breaks to the schedule
     add_breaks_to_schedule(schedule, breaks)
@@ -148,28 +330,58 @@ def create_schedule(lectures, class_config, break_config):
     return schedule
 
 
+def create_schedules(
+    sections,
+    class_config,
+    break_config,
+    metrics=None,
+    constraints=None,
+    strict=True,
+):
+    """Schedule several sections that share professors and rooms.
+
+    `sections` maps a section name to its list of lectures. Returns a schedule
+    per section and the shared resource index. With strict=False, hours that
+    do not fit are listed in each schedule's `unplaced` instead of raising
+    InfeasibleScheduleError.
+    """
+    grid = build_slot_grid(class_config, break_config)
+    resources = ResourceIndex()
+    schedules = {}
+    for section, lectures in sections.items():
+        schedules[section] = create_schedule(
+            lectures,
+            class_config,
+            break_config,
+            grid,
+            resources,
+            metrics,
+            strict=strict,
+            constraints=constraints,
+        )
+    return schedules, resources
+
+
 def print_schedule(schedule):
     """Display the schedule in a readable format."""
     for day, lectures in schedule.items():
-        lectures = sorted(
-            lectures, key=lambda x: time_to_minutes(x["Time"].split("-")[0])
-        )
+        lectures = sorted(lectures, key=lambda x: x.start)
         print(f"\n{day}")
         print("=" * 40)
         for lecture in lectures:
-            print(f"Course Name: {lecture['Course Name']}")
-            print(f"Time: {lecture['Time']}")
-            print(f"Professor Name: {lecture['Professor Name']}")
-            print(f"Corp: {lecture['Corp']}")
+            print(f"Course Name: {lecture.course_name}")
+            print(f"Time: {lecture.time}")
+            print(f"Professor Name: {lecture.professor_name}")
+            print(f"Corp: {lecture.corp_name}")
             print("-" * 40)
 
 
 def print_schedule_table(schedule):
     """Display the schedule in a table format."""
+    from prettytable import PrettyTable
+
     for day, lectures in schedule.items():
-        lectures = sorted(
-            lectures, key=lambda x: time_to_minutes(x["Time"].split("-")[0])
-        )
+        lectures = sorted(lectures, key=lambda x: x.start)
         # Create a table for each day
         table = PrettyTable()
         table.field_names = ["Course Name", "Time", "Professor Name", "Corp"]
@@ -178,10 +390,10 @@ def print_schedule_table(schedule):
         for lecture in lectures:
             table.add_row(
                 [
-                    lecture["Course Name"],
-                    lecture["Time"],
-                    lecture["Professor Name"],
-                    lecture["Corp"],
+                    lecture.course_name,
+                    lecture.time,
+                    lecture.professor_name,
+                    lecture.corp_name,
                 ]
             )
 
@@ -191,49 +403,108 @@ def print_schedule_table(schedule):
 
 
 def create_gui_schedule(schedule):
-    """Create a GUI window to display the schedule in table format."""
+    """Create a GUI window to display the schedule in a scrollable table.
+
+    Rows are only put into the table a chunk at a time as the view scrolls
+    towards the end, so large schedules open quickly. The day, professor and
+    course filters swap the rows of the same table instead of rebuilding it.
+    """
+    import tkinter as tk
+    from tkinter import ttk
+
     # Initialize the main window
     root = tk.Tk()
     root.title("Weekly Schedule")
+    root.columnconfigure(0, weight=1)
+    root.rowconfigure(1, weight=1)
+
+    # Every placement in display order, as references rather than widgets
+    rows = [
+        (day, lecture)
+        for day, lectures in schedule.items()
+        for lecture in sorted(lectures, key=lambda x: x.start)
+    ]
+    pool = schedule.pool
+
+    # Filter boxes above the table
+    filters = ttk.Frame(root, padding="10")
+    filters.grid(row=0, column=0, sticky="ew")
+    choices = {
+        "Day": list(schedule),
+        "Professor": sorted(
+            {lecture.professor_name for _, lecture in rows if lecture.kind != "break"}
+        ),
+        "Course": sorted({lecture.course_name for _, lecture in rows}),
+    }
+    selected = {}
+    for col, (label, values) in enumerate(choices.items()):
+        ttk.Label(filters, text=label, font=("Arial", 10, "bold")).grid(
+            row=0, column=2 * col, padx=5
+        )
+        selected[label] = tk.StringVar(value="All")
+        box = ttk.Combobox(
+            filters,
+            textvariable=selected[label],
+            values=["All"] + values,
+            state="readonly",
+        )
+        box.grid(row=0, column=2 * col + 1, padx=5)
+        box.bind("<<ComboboxSelected>>", lambda event: apply_filters())
 
     # Create a frame to hold the table
     frame = ttk.Frame(root, padding="10")
-    frame.grid(row=0, column=0)
+    frame.grid(row=1, column=0, sticky="nsew")
+    frame.columnconfigure(0, weight=1)
+    frame.rowconfigure(0, weight=1)
 
     # Define the headers
     headers = ["Day", "Course Name", "Timing", "Professor"]
-    for col, header in enumerate(headers):
-        label = ttk.Label(frame, text=header, font=("Arial", 12, "bold"))
-        label.grid(row=0, column=col, padx=10, pady=5)
-
-    # Fill in the schedule data for each day
-    row_index = 1
-    for day, lectures in schedule.items():
-        day_label = ttk.Label(frame, text=day, font=("Arial", 12, "bold"))
-        day_label.grid(row=row_index, column=0, padx=10, pady=5, sticky="w")
-
-        # Sort lectures based on time
-        lectures = sorted(
-            lectures, key=lambda x: time_to_minutes(x["Time"].split("-")[0])
-        )
-
-        for lecture in lectures:
-            course_label = ttk.Label(
-                frame, text=lecture["Course Name"], font=("Arial", 10)
+    tree = ttk.Treeview(frame, columns=headers, show="headings", height=25)
+    for header in headers:
+        tree.heading(header, text=header)
+        tree.column(header, width=200)
+    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    tree.grid(row=0, column=0, sticky="nsew")
+    scrollbar.grid(row=0, column=1, sticky="ns")
+
+    visible = []  # Rows that match the filters
+    shown = [0]  # How many of them are in the table so far
+
+    def materialize():
+        """Insert the next chunk of matching rows into the table."""
+        end = min(shown[0] + GUI_CHUNK_ROWS, len(visible))
+        for day, lecture in visible[shown[0] : end]:
+            tree.insert(
+                "",
+                "end",
+                values=(day, lecture.course_name, lecture.time, lecture.professor_name),
             )
-            course_label.grid(row=row_index, column=1, padx=10, pady=5)
-
-            timing_label = ttk.Label(frame, text=lecture["Time"], font=("Arial", 10))
-            timing_label.grid(row=row_index, column=2, padx=10, pady=5)
-
-            professor_label = ttk.Label(
-                frame, text=lecture["Professor Name"], font=("Arial", 10)
-            )
-            professor_label.grid(row=row_index, column=3, padx=10, pady=5)
-
-            row_index += 1
-
-        row_index += 1  # Leave a gap after each day's schedule
+        shown[0] = end
+
+    def on_scroll(first, last):
+        scrollbar.set(first, last)
+        # Load more rows once the view gets close to the last one in the table
+        if float(last) > 0.9 and shown[0] < len(visible):
+            materialize()
+
+    tree.configure(yscrollcommand=on_scroll)
+
+    def apply_filters():
+        day = selected["Day"].get()
+        professor = pool.ids.get(selected["Professor"].get())
+        course = pool.ids.get(selected["Course"].get())
+        visible[:] = [
+            (lecture_day, lecture)
+            for lecture_day, lecture in rows
+            if (day == "All" or lecture_day == day)
+            and (professor is None or lecture.professor == professor)
+            and (course is None or lecture.course == course)
+        ]
+        tree.delete(*tree.get_children())
+        shown[0] = 0
+        materialize()
+
+    apply_filters()
 
     # Start the GUI loop
     root.mainloop()
@@ -241,6 +512,9 @@ def create_gui_schedule(schedule):
 
 def save_schedule_to_excel(schedule, filename="schedule.xlsx"):
     """Save the schedule to an Excel file."""
+    import openpyxl
+    from openpyxl.styles import Alignment, Font
+
     # Create a new workbook and select the active sheet
     wb = openpyxl.Workbook()
     sheet = wb.active
@@ -248,52 +522,169 @@ def save_schedule_to_excel(schedule, filename="schedule.xlsx"):
 
     # Set the headers
     headers = ["Day", "Course Name", "Time", "Professor Name", "Corp"]
+    widths = [len(header) for header in headers]
     for col_num, header in enumerate(headers, 1):
         cell = sheet.cell(row=1, column=col_num, value=header)
         cell.font = Font(bold=True)
         cell.alignment = Alignment(horizontal="center", vertical="center")
 
-    # Fill in the schedule data
+    # Fill in the schedule data, keeping track of the widest value per column
     row_num = 2  # Start filling data from the second row
     for day, lectures in schedule.items():
-        lectures = sorted(
-            lectures, key=lambda x: time_to_minutes(x["Time"].split("-")[0])
-        )
+        lectures = sorted(lectures, key=lambda x: x.start)
         for lecture in lectures:
-            sheet.cell(row=row_num, column=1, value=day)
-            sheet.cell(row=row_num, column=2, value=lecture["Course Name"])
-            sheet.cell(row=row_num, column=3, value=lecture["Time"])
-            sheet.cell(row=row_num, column=4, value=lecture["Professor Name"])
-            sheet.cell(row=row_num, column=5, value=lecture["Corp"])
+            row = [
+                day,
+                lecture.course_name,
+                lecture.time,
+                lecture.professor_name,
+                lecture.corp_name,
+            ]
+            for col_num, value in enumerate(row, 1):
+                sheet.cell(row=row_num, column=col_num, value=value)
+                widths[col_num - 1] = max(widths[col_num - 1], len(value))
             row_num += 1
 
     # Auto-adjust column widths
-    for col in sheet.columns:
-        max_length = 0
-        column = col[0].column_letter  # Get the column name
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(cell.value)
-            except:
-                pass
-        adjusted_width = max_length + 2
-        sheet.column_dimensions[column].width = adjusted_width
+    for col_num, width in enumerate(widths, 1):
+        column = openpyxl.utils.get_column_letter(col_num)
+        sheet.column_dimensions[column].width = width + 2
 
     # Save the workbook to the given filename
     wb.save(filename)
     print(f"Schedule saved to {filename} successfully!")
 
 
-if __name__ == "__main__":
-    class_config, break_config = load_config()
-    lectures = [
+def sheet_title(name):
+    """Make `name` usable as an Excel sheet title."""
+    for char in "[]:*?/\\":
+        name = name.replace(char, "-")
+    return name[:31] or "Sheet"
+
+
+def save_schedule_to_excel_streaming(
+    schedules, filename="schedule.xlsx", split_by=None
+):
+    """Stream one or more schedules to an Excel file.
+
+    `schedules` is a single schedule or a mapping of section name to schedule.
+    `split_by` puts the rows on one sheet per "day", "section" or "professor"
+    instead of a single sheet. Rows go straight from the schedules to a
+    write-only workbook, one sorted day at a time, and column widths come from
+    the interned names rather than from a second pass over the cells. Only
+    split_by="professor" collects references to every placement first, since
+    a professor's rows are spread over all the sections.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font
+
+    if isinstance(schedules, Schedule):
+        schedules = {"": schedules}
+    with_section = any(schedules)
+
+    headers = ["Day", "Course Name", "Time", "Professor Name", "Corp"]
+    if with_section:
+        headers.insert(0, "Section")
+
+    # Widths from the distinct values only
+    widths = [len(header) for header in headers]
+    offset = 1 if with_section else 0
+    if with_section:
+        widths[0] = max([widths[0]] + [len(str(section)) for section in schedules])
+    for schedule in schedules.values():
+        longest = max((len(name) for name in schedule.pool.names), default=0)
+        widths[offset] = max([widths[offset]] + [len(day) for day in schedule])
+        for col in (offset + 1, offset + 3, offset + 4):
+            widths[col] = max(widths[col], longest)
+    widths[offset + 2] = max(widths[offset + 2], len("00:00-00:00"))
+
+    day_order = {}
+    for schedule in schedules.values():
+        for day in schedule:
+            day_order.setdefault(day, len(day_order))
+    sections = sorted(schedules, key=str)
+
+    def section_rows(section, days):
+        """(section, day, placement) of one section in time order."""
+        schedule = schedules[section]
+        for day in days:
+            if day in schedule:
+                for lecture in schedule.sorted_day(day):
+                    yield section, day, lecture
+
+    def all_rows(days):
+        for section in sections:
+            yield from section_rows(section, days)
+
+    if split_by == "day":
+        groups = ((day, all_rows([day])) for day in day_order)
+    elif split_by == "section":
+        groups = (
+            (str(section), section_rows(section, day_order)) for section in schedules
+        )
+    elif split_by == "professor":
+        # References to the placements, never their formatted rows
+        by_professor = {}
+        for section, schedule in schedules.items():
+            for day, lectures in schedule.items():
+                for lecture in lectures:
+                    if lecture.kind != "break":
+                        by_professor.setdefault(lecture.professor_name, []).append(
+                            (section, day, lecture)
+                        )
+        for rows in by_professor.values():
+            rows.sort(key=lambda row: (str(row[0]), day_order[row[1]], row[2].start))
+        groups = by_professor.items()
+    else:
+        groups = [("Weekly Schedule", all_rows(day_order))]
+
+    wb = openpyxl.Workbook(write_only=True)
+    used_titles = set()
+    for group, rows in groups:
+        title = sheet_title(group)
+        while title in used_titles:
+            title = sheet_title(f"{title[:28]}_{len(used_titles)}")
+        used_titles.add(title)
+        sheet = wb.create_sheet(title)
+        for col_num, width in enumerate(widths, 1):
+            column = openpyxl.utils.get_column_letter(col_num)
+            sheet.column_dimensions[column].width = width + 2
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            header_cells.append(cell)
+        sheet.append(header_cells)
+
+        for section, day, lecture in rows:
+            row = [
+                day,
+                lecture.course_name,
+                lecture.time,
+                lecture.professor_name,
+                lecture.corp_name,
+            ]
+            if with_section:
+                row.insert(0, section)
+            sheet.append(row)
+
+    wb.save(filename)
+    print(f"Schedule saved to {filename} successfully!")
+
+
+def sample_lectures():
+    """The built-in demo section."""
+    return [
         Lecture(
             name="Introduction to Programming",
             corp="Dr. Shaun Murphy",
             credit=3,
             professor="Dr. Clair Brown",
             hpw=5,
+            labs_per_week=1,
         ),
         Lecture(
             name="Data Structures",
@@ -301,6 +692,7 @@ if __name__ == "__main__":
             credit=4,
             professor="Dr. Kalu Jared",
             hpw=4,
+            labs_per_week=1,
         ),
         Lecture(
             name="Algorithms",
@@ -314,7 +706,7 @@ if __name__ == "__main__":
             corp="Dr. Lim Audrey",
             credit=4,
             professor="Dr. Glassman Aaron",
-            hpw=6,
+            hpw=4,
         ),
         Lecture(
             name="Operating Systems",
@@ -328,7 +720,7 @@ if __name__ == "__main__":
             corp="Dr. Andrews Marcus",
             credit=3,
             professor="Dr. Lim Audrey",
-            hpw=5,
+            hpw=4,
         ),
         Lecture(
             name="Software Engineering",
@@ -346,8 +738,193 @@ if __name__ == "__main__":
         ),
     ]
 
-    schedule = create_schedule(lectures, class_config, break_config)
-    # print_schedule(schedule)
-    # print_schedule_table(schedule)
-    # create_gui_schedule(schedule)
-    save_schedule_to_excel(schedule)
+
+def measure_cold_start(runs=5):
+    """Time `import Scheduler` in fresh interpreters and report the median.
+
+    Also lists which output backends the import pulled in; there should be
+    none.
+    """
+    probe = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        "import Scheduler\n"
+        "elapsed = time.perf_counter() - started\n"
+        "backends = ('tkinter', 'openpyxl', 'prettytable')\n"
+        "print(elapsed, *[m for m in backends if m in sys.modules])\n"
+    )
+    timings = []
+    backends = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed, *backends = result.stdout.split()
+        timings.append(float(elapsed))
+    timings.sort()
+    return {
+        "median_seconds": timings[len(timings) // 2],
+        "runs": runs,
+        "backends_imported": backends,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a weekly schedule.")
+    parser.add_argument(
+        "--format",
+        choices=["excel", "table", "text", "gui", "json"],
+        default="excel",
+        help="output backend; only the selected one is imported",
+    )
+    parser.add_argument("--output", help="file for excel or json output")
+    parser.add_argument(
+        "--lectures", help="CSV or JSON lecture catalogue (default: demo section)"
+    )
+    parser.add_argument(
+        "--improve",
+        type=float,
+        default=0.0,
+        help="seconds of local search after the greedy pass (default: none)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="random seed of the --improve search; a run cut short by its "
+        "time limit may still differ between machines",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="always regenerate the schedule"
+    )
+    parser.add_argument(
+        "--cold-start",
+        action="store_true",
+        help="measure how long importing the scheduler takes and exit",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="print scheduler counters and timings to stderr (skips the cache)",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="check the schedule's hard constraints and print violations to stderr",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["bitmask", "numpy"],
+        default="bitmask",
+        help="free slot search; numpy needs the numpy package",
+    )
+    parser.add_argument(
+        "--constraints",
+        default="Constraints.txt",
+        help="constraint spec file (skipped if it does not exist)",
+    )
+    parser.add_argument(
+        "--day-strategy",
+        choices=["round_robin", "load"],
+        default="round_robin",
+        help="how lectures pick their day; load fills the emptiest day first",
+    )
+    parser.add_argument("--verbose", action="store_true", help="debug logging")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    if args.cold_start:
+        print(json.dumps(measure_cold_start()))
+        return
+
+    class_config, break_config = load_config()
+    if args.lectures:
+        from lecture_store import load_lectures
+
+        lectures = list(load_lectures(args.lectures))
+    else:
+        lectures = sample_lectures()
+
+    constraints = []
+    if os.path.exists(args.constraints):
+        constraints = load_constraints(args.constraints)
+    metrics = SchedulerMetrics() if args.metrics else None
+
+    def build():
+        schedule = create_schedule(
+            lectures,
+            class_config,
+            break_config,
+            metrics=metrics,
+            backend=args.backend,
+            constraints=constraints,
+            day_strategy=args.day_strategy,
+        )
+        if args.improve > 0:
+            improve_schedule(
+                schedule,
+                class_config,
+                break_config,
+                time_limit=args.improve,
+                seed=args.seed,
+                constraints=constraints,
+            )
+        return schedule
+
+    try:
+        if args.no_cache or metrics is not None:
+            schedule = build()
+            if metrics is not None:
+                print(json.dumps(metrics.as_dict(), indent=2), file=sys.stderr)
+        else:
+            # Unchanged lectures and configs reuse the stored schedule
+            cache = ScheduleCache()
+            engine = "Scheduler"
+            if args.day_strategy != "round_robin":
+                engine = f"Scheduler:{args.day_strategy}"
+            if args.improve > 0:
+                # The post-pass changes the schedule, so its budget is part of
+                # what was built; other budgets must not reuse this entry
+                engine += f"+improve={args.improve:g},seed={args.seed}"
+            key = cache_key(
+                lectures,
+                class_config,
+                break_config,
+                engine,
+                constraints=constraints,
+            )
+            schedule = cache.get_or_create(key, build)
+    except InfeasibleScheduleError as error:
+        parser.exit(1, f"Cannot schedule these lectures: {error}\n")
+
+    if args.validate:
+        from validator import validate_schedule
+
+        for violation in validate_schedule(
+            schedule, class_config, break_config, lectures
+        ):
+            print(json.dumps(violation), file=sys.stderr)
+
+    if args.format == "excel":
+        save_schedule_to_excel_streaming(schedule, args.output or "schedule.xlsx")
+    elif args.format == "table":
+        print_schedule_table(schedule)
+    elif args.format == "text":
+        print_schedule(schedule)
+    elif args.format == "gui":
+        create_gui_schedule(schedule)
+    elif args.format == "json":
+        from exporters import dump_jsonl, write_jsonl
+
+        if args.output:
+            write_jsonl(schedule, args.output)
+        else:
+            dump_jsonl(schedule, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
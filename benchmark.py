@@ -0,0 +1,296 @@
+import argparse
+import copy
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import time
+from datetime import datetime
+
+from config import load_config
+from Lecture import Lecture
+
+ENGINES = ["scheduler", "mytimetable", "cpsat"]
+
+
+def break_pattern_config(break_config, pattern):
+    """Copy of `break_config` with one of the benchmark break patterns.
+
+    "config" keeps the breaks as configured, "none" removes them and "dense"
+    adds a 10 minute break every two hours on top of them.
+    """
+    break_config = copy.deepcopy(break_config)
+    if pattern == "none":
+        break_config["Breaks"] = {}
+    elif pattern == "dense":
+        break_config["Breaks"]["DENSE"] = {
+            "name": "Dense Break",
+            "total": 4,
+            "duration": 10,
+            "timeing": ["09:55-10:05", "11:55-12:05", "14:55-15:05", "16:55-17:05"],
+        }
+    return break_config
+
+
+def generate_instance(
+    departments=2,
+    semesters=2,
+    courses_per_department=4,
+    professors=8,
+    rooms=4,
+    break_pattern="config",
+    seed=0,
+):
+    """Random instance in the shape test.py's CP-SAT model expects.
+
+    Each (department, semester) pair is one section. Rooms are dealt out to
+    blocks, one block per department.
+    """
+    rng = random.Random(seed)
+    dept_names = [f"D{i}" for i in range(departments)]
+    professor_names = [f"Prof {i}" for i in range(professors)]
+    room_names = [f"R{i}" for i in range(max(rooms, departments))]
+    blocks = {f"Block{i}": [] for i in range(departments)}
+    for i, room in enumerate(room_names):
+        blocks[f"Block{i % departments}"].append(room)
+
+    subjects = {}
+    subject_hours = {}
+    subject_professors = {}
+    for i, dept in enumerate(dept_names):
+        subjects[dept] = []
+        for c in range(courses_per_department):
+            subject = f"{dept} Course {c}"
+            subjects[dept].append(subject)
+            subject_hours[subject] = rng.randint(2, 4)
+            subject_professors[subject] = rng.choice(professor_names)
+
+    class_config, break_config = load_config()
+    return {
+        'departments': {'All': dept_names},
+        'semesters': [f"Sem{i}" for i in range(semesters)],
+        'subjects': subjects,
+        'rooms': blocks,
+        'room_capacity': {room: 30 for room in room_names},
+        'department_blocks': {
+            dept: [f"Block{i}"] for i, dept in enumerate(dept_names)
+        },
+        'subject_hours': subject_hours,
+        'subject_professors': subject_professors,
+        'class_config': class_config,
+        'break_config': break_pattern_config(break_config, break_pattern),
+        'seed': seed,
+    }
+
+
+def sections_from_instance(instance):
+    """Greedy Lectures for every section, each with a room from its block."""
+    rng = random.Random(instance['seed'])
+    sections = {}
+    for dept, subs in instance['subjects'].items():
+        block_rooms = [
+            room
+            for block in instance['department_blocks'][dept]
+            for room in instance['rooms'][block]
+        ]
+        for sem in instance['semesters']:
+            sections[f"{dept} {sem}"] = [
+                Lecture(
+                    name=sub,
+                    corp=dept,
+                    credit=3,
+                    professor=instance['subject_professors'][sub],
+                    hpw=instance['subject_hours'][sub],
+                    room=rng.choice(block_rooms),
+                    code=sub,
+                )
+                for sub in subs
+            ]
+    return sections
+
+
+def placed_hours(schedules):
+    return sum(
+        1
+        for schedule in schedules.values()
+        for placements in schedule.values()
+        for placement in placements
+        if placement.kind == "lecture"
+    )
+
+
+def run_engine(engine, instance, solver_time_limit):
+    """Run one engine on one instance and return its measurements."""
+    class_config = instance['class_config']
+    break_config = instance['break_config']
+    sections = sections_from_instance(instance)
+    requested = sum(lecture.hpw for lectures in sections.values() for lecture in lectures)
+    result = {"requested": requested}
+
+    started = time.perf_counter()
+    if engine == "scheduler":
+        from Scheduler import create_schedules
+
+        schedules, _ = create_schedules(sections, class_config, break_config)
+        result["placed"] = placed_hours(schedules)
+    elif engine == "mytimetable":
+        import mytimetable
+
+        schedules = {
+            section: mytimetable.create_schedule(lectures, class_config, break_config)
+            for section, lectures in sections.items()
+        }
+        result["placed"] = placed_hours(schedules)
+    elif engine == "cpsat":
+        import test as cpsat
+        from slots import build_slot_grid
+
+        grid = build_slot_grid(class_config, break_config)
+        model, schedule, stats = cpsat.build_model(instance, grid)
+        result["build_seconds"] = time.perf_counter() - started
+        result.update(stats)
+        _, timetable = cpsat.solve(
+            model, schedule, time_limit=solver_time_limit, on_solution=None
+        )
+        result["placed"] = len(timetable) if timetable else 0
+    else:
+        raise ValueError(f"Unknown engine {engine!r}")
+    result["wall_seconds"] = time.perf_counter() - started
+    result["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def worker(engine, instance, solver_time_limit, results):
+    try:
+        results.put(run_engine(engine, instance, solver_time_limit))
+    except Exception as error:  # Reported as a failed case, not a crash
+        results.put({"error": f"{type(error).__name__}: {error}"})
+
+
+def run_case(engine, instance, timeout, solver_time_limit):
+    """Run one case in a fresh process so memory and hangs stay isolated."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(
+        target=worker, args=(engine, instance, solver_time_limit, results)
+    )
+    started = time.perf_counter()
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return {"status": "timeout", "wall_seconds": time.perf_counter() - started}
+    result = results.get() if not results.empty() else {"error": "no result"}
+    result["status"] = "error" if "error" in result else "ok"
+    if result.get("requested"):
+        result["success_rate"] = result["placed"] / result["requested"]
+    return result
+
+
+def run_benchmarks(sizes, engines, timeout=60.0, solver_time_limit=10.0, seed=0):
+    """Time every engine on an instance of every size.
+
+    `sizes` is a list of generate_instance() keyword dicts.
+    """
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [],
+    }
+    for size in sizes:
+        instance = generate_instance(seed=seed, **size)
+        for engine in engines:
+            result = run_case(engine, instance, timeout, solver_time_limit)
+            result.update({"engine": engine, "size": size})
+            report["results"].append(result)
+            print(
+                f"{engine:12} {json.dumps(size)} {result['status']:8} "
+                f"{result.get('wall_seconds', 0):8.3f}s "
+                f"placed {result.get('success_rate', 0):.0%}"
+            )
+    return report
+
+
+def compare_reports(old, new, tolerance=0.2):
+    """Cases that got more than `tolerance` slower or placed fewer hours."""
+    previous = {
+        (result["engine"], json.dumps(result["size"], sort_keys=True)): result
+        for result in old["results"]
+    }
+    regressions = []
+    for result in new["results"]:
+        key = (result["engine"], json.dumps(result["size"], sort_keys=True))
+        before = previous.get(key)
+        if before is None or before["status"] != "ok":
+            continue
+        if result["status"] != "ok":
+            regressions.append((key, "status", before["status"], result["status"]))
+            continue
+        if result["wall_seconds"] > before["wall_seconds"] * (1 + tolerance):
+            regressions.append(
+                (key, "wall_seconds", before["wall_seconds"], result["wall_seconds"])
+            )
+        if result.get("success_rate", 1) < before.get("success_rate", 1):
+            regressions.append(
+                (key, "success_rate", before["success_rate"], result["success_rate"])
+            )
+    return regressions
+
+
+def default_sizes(scales):
+    return [
+        {
+            "departments": 2 * scale,
+            "semesters": 2,
+            "courses_per_department": 4,
+            "professors": 8 * scale,
+            "rooms": 4 * scale,
+        }
+        for scale in scales
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling engines.")
+    parser.add_argument(
+        "--scales",
+        default="1,2,4",
+        help="comma separated instance scales (departments, professors and rooms grow with it)",
+    )
+    parser.add_argument(
+        "--engines", default=",".join(ENGINES), help="comma separated engines to run"
+    )
+    parser.add_argument(
+        "--break-pattern", choices=["config", "none", "dense"], default="config"
+    )
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per case")
+    parser.add_argument(
+        "--solver-time-limit", type=float, default=10.0, help="CP-SAT budget per case"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="earlier report to check for regressions")
+    args = parser.parse_args()
+
+    sizes = default_sizes(int(scale) for scale in args.scales.split(","))
+    for size in sizes:
+        size["break_pattern"] = args.break_pattern
+    report = run_benchmarks(
+        sizes,
+        args.engines.split(","),
+        args.timeout,
+        args.solver_time_limit,
+        args.seed,
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_reports(json.load(f), report)
+        for regression in regressions:
+            print("Regression:", *regression)
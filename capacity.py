@@ -0,0 +1,119 @@
+class InfeasibleScheduleError(ValueError):
+    """The lectures cannot fit the slot grid whatever order they are placed in.
+
+    `problems` lists one dict per shortfall with the course (None for the
+    whole section), what it needs, what is available and why.
+    """
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(
+            "; ".join(
+                f"{problem['course'] or 'section'}: needs {problem['needed']} "
+                f"{problem['unit']}, at most {problem['available']} "
+                f"({problem['reason']})"
+                for problem in problems
+            )
+        )
+
+
+def lecture_slots_per_lab(grid, day):
+    """Fewest lecture slots a lab on `day` can cover, 0 if labs never fit."""
+    fewest = None
+    for lab_start, lab_end in grid.slots["lab"][day]:
+        covered = sum(
+            1
+            for start, end in grid.slots["lecture"][day]
+            if start < lab_end and end > lab_start
+        )
+        fewest = covered if fewest is None else min(fewest, covered)
+    return fewest or 0
+
+
+def capacity_problems(lectures, class_config, grid):
+    """Shortfalls that make a section unschedulable, in O(days x slots).
+
+    A lecture gets at most min(MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY,
+    MAX_LECTURES_PER_DAY, slots that day) hours a day and at most one lab a
+    day. A section gets at most MAX_LECTURES_PER_DAY lectures a day, and all
+    lectures and labs together must fit the week's lecture slots. Passing the
+    check does not promise a full schedule, since busy professors and rooms
+    are not considered.
+    """
+    days = grid.days
+    per_day_cap = min(
+        class_config["MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY"],
+        class_config["MAX_LECTURES_PER_DAY"],
+    )
+    lecture_capacity = sum(min(per_day_cap, grid.slot_count(day)) for day in days)
+    lab_days = sum(1 for day in days if grid.slot_count(day, "lab"))
+    weekly_slots = sum(grid.slot_count(day) for day in days)
+    lab_cost = min(
+        (lecture_slots_per_lab(grid, day) for day in days if grid.slot_count(day, "lab")),
+        default=0,
+    )
+
+    daily_total = sum(
+        min(class_config["MAX_LECTURES_PER_DAY"], grid.slot_count(day))
+        for day in days
+    )
+
+    problems = []
+    needed = 0
+    hours = 0
+    for lecture in lectures:
+        labs_per_week = getattr(lecture, "labs_per_week", 0)
+        if lecture.hpw > lecture_capacity:
+            problems.append(
+                {
+                    "course": lecture.course_name,
+                    "kind": "lecture",
+                    "unit": "hours",
+                    "needed": lecture.hpw,
+                    "available": lecture_capacity,
+                    "reason": "per-day lecture caps",
+                }
+            )
+        if labs_per_week > lab_days:
+            problems.append(
+                {
+                    "course": lecture.course_name,
+                    "kind": "lab",
+                    "unit": "labs",
+                    "needed": labs_per_week,
+                    "available": lab_days,
+                    "reason": "one lab per day",
+                }
+            )
+        needed += lecture.hpw + labs_per_week * lab_cost
+        hours += lecture.hpw
+    if hours > daily_total:
+        problems.append(
+            {
+                "course": None,
+                "kind": "lecture",
+                "unit": "hours",
+                "needed": hours,
+                "available": daily_total,
+                "reason": "MAX_LECTURES_PER_DAY for the section",
+            }
+        )
+    if needed > weekly_slots:
+        problems.append(
+            {
+                "course": None,
+                "kind": "lecture",
+                "unit": "slots",
+                "needed": needed,
+                "available": weekly_slots,
+                "reason": "weekly lecture slots",
+            }
+        )
+    return problems
+
+
+def check_capacity(lectures, class_config, grid):
+    """Raise InfeasibleScheduleError if the lectures can never fit the grid."""
+    problems = capacity_problems(lectures, class_config, grid)
+    if problems:
+        raise InfeasibleScheduleError(problems)
@@ -0,0 +1,30 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def time_to_minutes(t):
+    """Convert HH:MM time string to minutes."""
+    return int(t.split(":")[0]) * 60 + int(t.split(":")[1])
+
+
+def load_config():
+    """Load class and break configurations from JSON files."""
+    with open("class.config.json") as f:
+        class_config = json.load(f)
+    with open("break.config.json") as f:
+        break_config = json.load(f)
+    return class_config, break_config
+
+
+def parse_break_times(break_config):
+    """Convert break times to minutes."""
+    breaks = []
+    for break_type in break_config["Breaks"]:
+        for timing in break_config["Breaks"][break_type]["timeing"]:
+            start_time, end_time = timing.split("-")
+            breaks.append((time_to_minutes(start_time), time_to_minutes(end_time)))
+
+    logger.debug("Breaks: %s", breaks)
+    return breaks
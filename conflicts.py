@@ -0,0 +1,136 @@
+try:
+    import numpy
+except ImportError:  # The NumPy backend is optional
+    numpy = None
+
+
+class ConflictMatrix:
+    """Slot occupancy of one section, its professors and rooms as NumPy arrays.
+
+    Every array is day x slot booleans (True = busy) over one kind of slot of
+    a SlotGrid, padded with busy slots where a day has fewer. Professors and
+    rooms are stacked into one array each, so the legal starts of N lectures
+    come from a single vectorised expression instead of N scans.
+    """
+
+    def __init__(self, grid, kind="lecture"):
+        if numpy is None:
+            raise ImportError("The NumPy backend needs numpy: pip install numpy")
+        self.grid = grid
+        self.kind = kind
+        self.days = list(grid.days)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        width = max((grid.slot_count(day, kind) for day in self.days), default=0)
+        self.starts = numpy.zeros((len(self.days), width), dtype=numpy.int32)
+        self.ends = numpy.zeros((len(self.days), width), dtype=numpy.int32)
+        self.padding = numpy.ones((len(self.days), width), dtype=bool)
+        for d, day in enumerate(self.days):
+            for s, (start, end) in enumerate(grid.slots[kind][day]):
+                self.starts[d, s] = start
+                self.ends[d, s] = end
+                self.padding[d, s] = False
+        self.section = self.padding.copy()
+        self.names = {"professor": {}, "room": {}}
+        self.busy = {
+            "professor": numpy.zeros((0,) + self.padding.shape, dtype=bool),
+            "room": numpy.zeros((0,) + self.padding.shape, dtype=bool),
+        }
+
+    def index_of(self, kind, name):
+        """Row of `name` in the professor or room array, added if new."""
+        names = self.names[kind]
+        index = names.get(name)
+        if index is None:
+            index = names[name] = len(names)
+            empty = numpy.zeros((1,) + self.padding.shape, dtype=bool)
+            self.busy[kind] = numpy.concatenate([self.busy[kind], empty])
+        return index
+
+    def mark(self, d, hit, professor, room, section):
+        if section:
+            self.section[d] |= hit
+        # Look the rows up first: a new name replaces the stacked array
+        if professor is not None:
+            index = self.index_of("professor", professor)
+            self.busy["professor"][index, d] |= hit
+        if room is not None:
+            index = self.index_of("room", room)
+            self.busy["room"][index, d] |= hit
+
+    def overlapping(self, day, start, end):
+        """Slots of `day` that overlap [start, end)."""
+        d = self.day_index[day]
+        return (self.starts[d] < end) & (self.ends[d] > start)
+
+    def reserve(self, day, start, end, professor=None, room=None, section=True):
+        hit = self.overlapping(day, start, end)
+        d = self.day_index[day]
+        self.mark(d, hit, professor, room, section)
+
+    def reserve_mask(self, day, mask, professor=None, room=None, section=True):
+        """Mark every slot overlapping a set bit of a minute bitmask."""
+        d = self.day_index[day]
+        hit = numpy.array(
+            [
+                bool(mask >> start & ((1 << (end - start)) - 1))
+                for start, end in zip(self.starts[d].tolist(), self.ends[d].tolist())
+            ],
+            dtype=bool,
+        )
+        hit &= ~self.padding[d]
+        self.mark(d, hit, professor, room, section)
+
+    def legal_starts(self, professors, rooms=None):
+        """N x day x slot booleans: where each of N lectures could start.
+
+        `professors[i]` and `rooms[i]` belong to lecture i; a room of None
+        means the lecture has no room to book.
+        """
+        if rooms is None:
+            rooms = [None] * len(professors)
+        professor_rows = [self.index_of("professor", name) for name in professors]
+        with_room = [i for i, room in enumerate(rooms) if room is not None]
+        room_rows = [self.index_of("room", rooms[i]) for i in with_room]
+        taken = self.section[numpy.newaxis] | self.busy["professor"][professor_rows]
+        if with_room:
+            taken[with_room] |= self.busy["room"][room_rows]
+        return ~taken
+
+    @classmethod
+    def from_state(cls, grid, occupancy, resources=None, professors=(), rooms=()):
+        """Build the matrix from bitmask DayOccupancy and ResourceIndex state.
+
+        Only the given professors and rooms are copied from `resources`.
+        """
+        matrix = cls(grid)
+        for day in matrix.days:
+            matrix.reserve_mask(day, occupancy[day].busy)
+            for professor in professors:
+                matrix.index_of("professor", professor)
+                if resources is not None:
+                    matrix.reserve_mask(
+                        day, resources.mask(day, professor), professor, section=False
+                    )
+            for room in rooms:
+                if room is None:
+                    continue
+                matrix.index_of("room", room)
+                if resources is not None:
+                    matrix.reserve_mask(
+                        day, resources.mask(day, room=room), room=room, section=False
+                    )
+        return matrix
+
+
+def lecture_legal_starts(matrix, lectures):
+    """legal_starts() for a list of lectures."""
+    return matrix.legal_starts(
+        [lecture.professor for lecture in lectures],
+        [getattr(lecture, "room", None) for lecture in lectures],
+    )
+
+
+def first_legal(legal, day_index, first):
+    """Index of the first True slot >= `first` in one day row, or None."""
+    found = numpy.flatnonzero(legal[day_index, first:])
+    return None if found.size == 0 else first + int(found[0])
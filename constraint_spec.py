@@ -0,0 +1,113 @@
+import shlex
+
+from config import time_to_minutes
+from occupancy import interval_mask
+
+# One rule per line of the spec file:
+#   unavailable professor "<name>" <day> [HH:MM-HH:MM]
+#   unavailable room "<name>" <day> [HH:MM-HH:MM]
+#   blocked <day> [HH:MM-HH:MM]
+# <day> is a day name or * for every day; no time means the whole day.
+TARGETS = ("professor", "room")
+
+
+def parse_rule(line, number=None):
+    """Turn one spec line into a rule dict, or None for blanks and comments."""
+    words = shlex.split(line, comments=True)
+    if not words:
+        return None
+    where = f"line {number}: " if number is not None else ""
+    if words[0] == "unavailable" and len(words) in (4, 5) and words[1] in TARGETS:
+        target, name, rest = words[1], words[2], words[3:]
+    elif words[0] == "blocked" and len(words) in (2, 3):
+        target, name, rest = "all", None, words[1:]
+    else:
+        raise ValueError(f"{where}cannot read constraint {line.strip()!r}")
+    day = rest[0]
+    if len(rest) > 1:
+        start_time, _, end_time = rest[1].partition("-")
+        start, end = time_to_minutes(start_time), time_to_minutes(end_time)
+        if start >= end:
+            raise ValueError(f"{where}empty time range {rest[1]!r}")
+    else:
+        start, end = 0, 24 * 60
+    return {"target": target, "name": name, "day": day, "start": start, "end": end}
+
+
+def parse_constraints(lines):
+    rules = []
+    for number, line in enumerate(lines, 1):
+        rule = parse_rule(line, number)
+        if rule is not None:
+            rules.append(rule)
+    return rules
+
+
+def load_constraints(filename="Constraints.txt"):
+    """Read the rules of a spec file."""
+    with open(filename) as f:
+        return parse_constraints(f)
+
+
+def rule_days(rule, days):
+    if rule["day"] == "*":
+        return days
+    if rule["day"] not in days:
+        raise ValueError(f"Unknown day {rule['day']!r} in constraint")
+    return [rule["day"]]
+
+
+def compile_masks(rules, days):
+    """Minute bitmasks of every rule: {(target, name): {day: mask}}.
+
+    Blocked times are under ("all", None).
+    """
+    masks = {}
+    for rule in rules:
+        by_day = masks.setdefault((rule["target"], rule["name"]), {})
+        mask = interval_mask(rule["start"], rule["end"])
+        for day in rule_days(rule, days):
+            by_day[day] = by_day.get(day, 0) | mask
+    return masks
+
+
+def blocked_masks(masks):
+    """{day: mask} of the times no section may use."""
+    return masks.get(("all", None), {})
+
+
+def reserve_resources(masks, resources):
+    """Mark unavailable professors and rooms as busy in a ResourceIndex."""
+    for (target, name), by_day in masks.items():
+        if target == "all":
+            continue
+        for day, mask in by_day.items():
+            days = resources.busy.setdefault((target, name), {})
+            days[day] = days.get(day, 0) | mask
+
+
+def apply_to_greedy(masks, occupancy, resources):
+    """Reserve compiled masks before placement starts.
+
+    Blocked times go into every day's occupancy and unavailable professors
+    and rooms into `resources`, so the greedy engine's existing free slot
+    search skips them with no extra work per probe.
+    """
+    for day, mask in blocked_masks(masks).items():
+        if day in occupancy:
+            occupancy[day].busy |= mask
+    reserve_resources(masks, resources)
+
+
+def forbidden_times(masks, grid):
+    """Weekly slot indices each rule rules out: {(target, name): set(times)}.
+
+    Used by the CP-SAT model to leave those variables out entirely.
+    """
+    forbidden = {}
+    for time, (day, index) in enumerate(grid.weekly_slots()):
+        slot = interval_mask(*grid.slot(day, index))
+        for key, by_day in masks.items():
+            if by_day.get(day, 0) & slot:
+                forbidden.setdefault(key, set()).add(time)
+    return forbidden
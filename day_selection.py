@@ -0,0 +1,39 @@
+import heapq
+
+
+class DayLoadHeap:
+    """Days ordered by how many free lecture slots they have left.
+
+    The emptiest day comes first; ties go to the earlier day of the week.
+    Entries are replaced lazily: take() pushes the day's new count and stale
+    entries are dropped when they reach the top, so picking a day is
+    O(log days) amortised.
+    """
+
+    def __init__(self, days, remaining):
+        self.order = {day: i for i, day in enumerate(days)}
+        self.remaining = dict(remaining)
+        self.heap = [(-self.remaining[day], self.order[day], day) for day in days]
+        heapq.heapify(self.heap)
+
+    def best(self, excluded=()):
+        """The emptiest day with a free slot that is not in `excluded`."""
+        skipped = []
+        found = None
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            count, _, day = entry
+            if -count != self.remaining[day]:
+                continue  # Stale, a newer entry is in the heap
+            skipped.append(entry)
+            if count < 0 and day not in excluded:
+                found = day
+                break
+        for entry in skipped:
+            heapq.heappush(self.heap, entry)
+        return found
+
+    def take(self, day):
+        """Count one more slot of `day` as used."""
+        self.remaining[day] -= 1
+        heapq.heappush(self.heap, (-self.remaining[day], self.order[day], day))
@@ -0,0 +1,121 @@
+import csv
+import json
+
+from config import time_to_minutes
+from placement import NamePool, Placement, Schedule, minutes_to_time
+
+COLUMNS = ["day", "start", "end", "course", "professor", "corp", "kind", "room"]
+# Rows held in memory at a time while writing Parquet
+PARQUET_BATCH_ROWS = 65536
+
+
+def iter_rows(schedule):
+    """Yield every placement as a row tuple in COLUMNS order, day by day."""
+    for day, placements in schedule.items():
+        for placement in sorted(placements, key=lambda p: p.start):
+            yield (
+                day,
+                minutes_to_time(placement.start),
+                minutes_to_time(placement.end),
+                placement.course_name,
+                placement.professor_name,
+                placement.corp_name,
+                placement.kind,
+                placement.room_name,
+            )
+
+
+def schedule_from_rows(rows, days=None):
+    """Build a schedule from row tuples in COLUMNS order.
+
+    Days keep the order they first appear in unless `days` is given.
+    """
+    pool = NamePool()
+    intern = pool.intern
+    schedule = Schedule(days or [], pool)
+    for day, start, end, course, professor, corp, kind, room in rows:
+        placements = schedule.get(day)
+        if placements is None:
+            placements = schedule[day] = []
+        placements.append(
+            Placement(
+                time_to_minutes(start),
+                time_to_minutes(end),
+                intern(course),
+                intern(professor),
+                intern(corp),
+                pool,
+                kind,
+                intern(room) if room else None,
+            )
+        )
+    return schedule
+
+
+def write_csv(schedule, filename):
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(iter_rows(schedule))
+
+
+def load_csv(filename, days=None):
+    with open(filename, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)  # Header
+        return schedule_from_rows(reader, days)
+
+
+def dump_jsonl(schedule, f):
+    """Write one JSON object per placement, one per line, to an open file."""
+    for row in iter_rows(schedule):
+        f.write(json.dumps(dict(zip(COLUMNS, row))))
+        f.write("\n")
+
+
+def write_jsonl(schedule, filename):
+    with open(filename, "w") as f:
+        dump_jsonl(schedule, f)
+
+
+def load_jsonl(filename, days=None):
+    with open(filename) as f:
+        rows = (
+            tuple(record[column] for column in COLUMNS)
+            for record in map(json.loads, f)
+        )
+        return schedule_from_rows(rows, days)
+
+
+def import_pyarrow():
+    """Parquet support is optional and pyarrow is slow to import, so it is
+    only loaded when a Parquet file is actually read or written."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet support needs pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def write_parquet(schedule, filename):
+    """Columnar export written in batches of rows (needs pyarrow)."""
+    pyarrow = import_pyarrow()
+    schema = pyarrow.schema([(column, pyarrow.string()) for column in COLUMNS])
+    with pyarrow.parquet.ParquetWriter(filename, schema) as writer:
+        columns = [[] for _ in COLUMNS]
+        for row in iter_rows(schedule):
+            for column, value in zip(columns, row):
+                column.append(value)
+            if len(columns[0]) >= PARQUET_BATCH_ROWS:
+                writer.write_batch(pyarrow.record_batch(columns, schema=schema))
+                columns = [[] for _ in COLUMNS]
+        if columns[0]:
+            writer.write_batch(pyarrow.record_batch(columns, schema=schema))
+
+
+def load_parquet(filename, days=None):
+    pyarrow = import_pyarrow()
+    table = pyarrow.parquet.read_table(filename, columns=COLUMNS)
+    columns = [table.column(column).to_pylist() for column in COLUMNS]
+    return schedule_from_rows(zip(*columns), days)
@@ -0,0 +1,125 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from occupancy import interval_mask
+
+# "break" only occurs with custom LECTURE_TIME_SLOTS that overlap a break:
+# generated slot grids already leave break times out
+REJECTION_REASONS = (
+    "break",
+    "overlap",
+    "resource",
+    "day_end",
+    "same_lecture_cap",
+    "daily_limit",
+)
+
+
+class SchedulerMetrics:
+    """Opt-in counters and timings for one or more create_schedule calls.
+
+    Pass an instance as `metrics=` to create_schedule. Counts slot probes,
+    rejected probes by reason (see REJECTION_REASONS), placements and day
+    rollovers, and times every lecture and phase. `callback`, if given, is
+    called as callback(event, data) for every event as it happens, so a
+    stalled run can be watched live.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.probes = 0
+        self.rejections = Counter()
+        self.placements = 0
+        self.rollovers = 0
+        self.lecture_seconds = {}
+        self.span_seconds = Counter()
+        self.lecture_started = None
+
+    def emit(self, event, **data):
+        if self.callback is not None:
+            self.callback(event, data)
+
+    def probe(self, day, slot):
+        self.probes += 1
+        self.emit("probe", day=day, slot=slot)
+
+    def reject(self, reason, day, slot=None):
+        self.rejections[reason] += 1
+        self.emit("reject", reason=reason, day=day, slot=slot)
+
+    def place(self, day, start, end, course_name):
+        self.placements += 1
+        self.emit("place", day=day, start=start, end=end, course=course_name)
+
+    def rollover(self, from_day, to_day):
+        self.rollovers += 1
+        self.emit("rollover", from_day=from_day, to_day=to_day)
+
+    def start_lecture(self, course_name):
+        self.lecture_started = (course_name, time.perf_counter())
+
+    def finish_lecture(self):
+        course_name, started = self.lecture_started
+        elapsed = time.perf_counter() - started
+        self.lecture_seconds[course_name] = (
+            self.lecture_seconds.get(course_name, 0) + elapsed
+        )
+        self.lecture_started = None
+        self.emit("lecture", course=course_name, seconds=elapsed)
+
+    @contextmanager
+    def span(self, name):
+        """Time a phase of scheduling, e.g. "labs" or "lectures"."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.span_seconds[name] += elapsed
+            self.emit("span", name=name, seconds=elapsed)
+
+    def as_dict(self):
+        return {
+            "probes": self.probes,
+            "rejections": {
+                reason: self.rejections[reason] for reason in REJECTION_REASONS
+            },
+            "placements": self.placements,
+            "rollovers": self.rollovers,
+            "lecture_seconds": dict(self.lecture_seconds),
+            "span_seconds": dict(self.span_seconds),
+        }
+
+
+def rejection_reason(grid, day, index, occupancy, break_mask, resource_mask):
+    """Why lecture slot `index` could not be used."""
+    start, end = grid.slot(day, index)
+    mask = interval_mask(start, end)
+    if mask & break_mask:
+        return "break"
+    if not occupancy.is_free(start, end):
+        return "overlap"
+    if mask & resource_mask:
+        return "resource"
+    return "overlap"  # Free but the lecture does not fit before the next block
+
+
+def record_probes(metrics, grid, day, first, found, occupancy, break_mask, resource_mask):
+    """Count the slots next_free_slot() stepped over to reach `found`.
+
+    The free slot search skips taken slots with a bitmask, so the probes it
+    saved are replayed here, only when metrics were asked for.
+    """
+    last = grid.slot_count(day) if found is None else found
+    for index in range(first, last):
+        metrics.probe(day, index)
+        metrics.reject(
+            rejection_reason(grid, day, index, occupancy, break_mask, resource_mask),
+            day,
+            index,
+        )
+    if found is None:
+        metrics.reject("day_end", day)
+    else:
+        metrics.probe(day, found)
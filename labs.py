@@ -0,0 +1,112 @@
+import logging
+from bisect import bisect_left, insort
+
+from occupancy import fit_mask, interval_mask, lowest_bit_from
+
+logger = logging.getLogger(__name__)
+
+
+class FreeRunIndex:
+    """Free intervals of the whole week kept sorted by length.
+
+    Each run is stored as (length, day_index, start, end), so the smallest run
+    that can hold a block is found with one bisect instead of a rescan.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def add(self, day_index, start, end):
+        if end > start:
+            insort(self.runs, (end - start, day_index, start, end))
+
+    def remove(self, run):
+        del self.runs[bisect_left(self.runs, run)]
+
+    def best_fit(self, duration, fit):
+        """Smallest run of at least `duration` minutes that `fit` accepts.
+
+        `fit(run)` returns the start to use inside the run or None to skip it.
+        Returns (run, start) or None.
+        """
+        for i in range(bisect_left(self.runs, (duration,)), len(self.runs)):
+            run = self.runs[i]
+            start = fit(run)
+            if start is not None:
+                return run, start
+        return None
+
+    def split(self, run, start, end):
+        """Take [start, end) out of `run` and keep the pieces left on each side."""
+        _, day_index, run_start, run_end = run
+        self.remove(run)
+        self.add(day_index, run_start, start)
+        self.add(day_index, end, run_end)
+
+
+def place_labs(lectures, schedule, occupancy, grid, resources=None):
+    """Place every lab session as one contiguous block using best fit.
+
+    Labs are placed before lectures so the long blocks go into the smallest
+    gaps that hold them and the rest of the day stays open. A course gets at
+    most one lab per day. With `resources` the professor and room must be free
+    as well. Returns the number of lab sessions that did not fit for each
+    course.
+    """
+    days = grid.days
+    lab_duration = grid.durations["lab"]
+    runs = FreeRunIndex()
+    for day_index, day in enumerate(days):
+        for start, end in occupancy[day].free_runs():
+            runs.add(day_index, start, end)
+
+    unplaced = {}
+    for lecture in lectures:
+        labs_per_week = getattr(lecture, "labs_per_week", 0)
+        if not labs_per_week:
+            continue
+        professor = lecture.professor
+        room = getattr(lecture, "room", None)
+        lab_days = set()
+
+        def fit(run):
+            _, day_index, start, end = run
+            if day_index in lab_days or end - lab_duration < start:
+                return None
+            day = days[day_index]
+            free = interval_mask(start, end)
+            if resources is not None:
+                free &= ~resources.mask(day, professor, room)
+            starts = grid.start_masks["lab"][day]
+            return lowest_bit_from(fit_mask(free, lab_duration) & starts, start)
+
+        for _ in range(labs_per_week):
+            found = runs.best_fit(lab_duration, fit)
+            if found is None:
+                unplaced[lecture.course_name] = (
+                    unplaced.get(lecture.course_name, 0) + 1
+                )
+                continue
+            run, start = found
+            day_index = run[1]
+            day = days[day_index]
+            end = start + lab_duration
+            runs.split(run, start, end)
+            occupancy[day].reserve(start, end)
+            if resources is not None:
+                resources.reserve(day, start, end, professor, room)
+            schedule.add(
+                day,
+                start,
+                end,
+                lecture.course_name,
+                professor,
+                lecture.course_name,
+                kind="lab",
+                room=room,
+            )
+            lab_days.add(day_index)
+
+    for course_name, count in unplaced.items():
+        logger.warning("Could not place %d lab session(s) for %s", count, course_name)
+    return unplaced
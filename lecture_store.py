@@ -0,0 +1,134 @@
+import csv
+import json
+
+from placement import NamePool
+
+
+class LectureRecord:
+    """Compact stand-in for Lecture with interned professor and corp names.
+
+    It has the attributes the schedulers read (course_name, professor, corp,
+    credit, hpw, labs_per_week, room, code), so a store can be passed anywhere
+    a list of Lectures is expected.
+    """
+
+    __slots__ = (
+        "course_name",
+        "professor_id",
+        "corp_id",
+        "credit",
+        "hpw",
+        "labs_per_week",
+        "room",
+        "code",
+        "pool",
+    )
+
+    def __init__(
+        self,
+        course_name,
+        professor_id,
+        corp_id,
+        credit,
+        hpw,
+        labs_per_week,
+        room,
+        code,
+        pool,
+    ):
+        self.course_name = course_name
+        self.professor_id = professor_id
+        self.corp_id = corp_id
+        self.credit = credit
+        self.hpw = hpw
+        self.labs_per_week = labs_per_week
+        self.room = room
+        self.code = code
+        self.pool = pool
+
+    @property
+    def professor(self):
+        return self.pool.names[self.professor_id]
+
+    @property
+    def corp(self):
+        return self.pool.names[self.corp_id]
+
+    @property
+    def hasLab(self):
+        return self.labs_per_week > 0
+
+    def __repr__(self):
+        return f"LectureRecord({self.code} {self.course_name!r})"
+
+
+class LectureStore:
+    """Bulk-loaded lectures with deterministic course codes.
+
+    Codes are "<initials><seed>" numbered in load order from `first_seed`,
+    so the same file always gives the same codes; `year`, if given, is put in
+    front as a prefix. A "code" column in the input is used as is. Professor
+    and corp names share one name pool.
+    """
+
+    def __init__(self, year=None, initials="CP", first_seed=100):
+        self.year = year
+        self.initials = initials
+        self.next_seed = first_seed
+        self.pool = NamePool()
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def professor_id(self, name):
+        return self.pool.ids.get(name)
+
+    def add_rows(self, rows):
+        """Append lectures from dicts with name, corp, credit, professor, hpw.
+
+        labs_per_week, room and code are optional.
+        """
+        intern = self.pool.intern
+        for row in rows:
+            code = row.get("code")
+            if not code:
+                code = f"{self.year or ''}{self.initials}{self.next_seed}"
+                self.next_seed += 1
+            self.records.append(
+                LectureRecord(
+                    row["name"],
+                    intern(row["professor"]),
+                    intern(row["corp"]),
+                    int(row["credit"]),
+                    int(row["hpw"]),
+                    int(row.get("labs_per_week") or 0),
+                    row.get("room") or None,
+                    code,
+                    self.pool,
+                )
+            )
+        return self
+
+    def load_csv(self, filename):
+        with open(filename, newline="") as f:
+            return self.add_rows(csv.DictReader(f))
+
+    def load_json(self, filename):
+        """Load a JSON list of lecture objects."""
+        with open(filename) as f:
+            return self.add_rows(json.load(f))
+
+
+def load_lectures(filename, **kwargs):
+    """Load a .csv or .json catalogue into a new LectureStore."""
+    store = LectureStore(**kwargs)
+    if filename.endswith(".json"):
+        return store.load_json(filename)
+    return store.load_csv(filename)
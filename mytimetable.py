@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 import json
 from Lecture import Lecture
+from placement import Schedule
+from schedule_cache import ScheduleCache, cache_key
 
 def time_to_minutes(t):
     return int(t.split(":")[0]) * 60 + int(t.split(":")[1])
@@ -24,7 +26,7 @@ def parse_break_times(break_config):
     return breaks
 
 def create_schedule(lectures, class_config, break_config):
-    schedule = {day: [] for day in class_config["DAYS"]}
+    schedule = Schedule(class_config["DAYS"])
     class_start_time = time_to_minutes(class_config["START_TIME"])
     class_end_time = time_to_minutes(class_config["END_TIME"])
     lecture_duration = class_config["LECTURE_DURATION"]
@@ -39,18 +41,12 @@ def create_schedule(lectures, class_config, break_config):
     
     def is_time_available(start_time, end_time, day_schedule):
         for lecture in day_schedule:
-            lec_start, lec_end = map(time_to_minutes, lecture["Time"].split("-"))
-            if not (end_time <= lec_start or start_time >= lec_end):
+            if not (end_time <= lecture.start or start_time >= lecture.end):
                 return False
         return True
     
     def add_lecture(day, course_name, professor_name, start_time, end_time):
-        schedule[day].append({
-            "Course Name": course_name,
-            "Time": f"{minutes_to_time(start_time)}-{minutes_to_time(end_time)}",
-            "Professor Name": professor_name,
-            "Corp": course_name
-        })
+        schedule.add(day, start_time, end_time, course_name, professor_name, course_name)
     
     for lecture in lectures:
         course_name = lecture.course_name
@@ -86,16 +82,14 @@ def create_schedule(lectures, class_config, break_config):
 
 def print_schedule(schedule):
     for day, lectures in schedule.items():
-        lectures = sorted(
-            lectures, key=lambda x: time_to_minutes(x["Time"].split("-")[0])
-        )
+        lectures = sorted(lectures, key=lambda x: x.start)
         print(f"\n{day}")
         print("=" * 40)
         for lecture in lectures:
-            print(f"Course Name: {lecture['Course Name']}")
-            print(f"Time: {lecture['Time']}")
-            print(f"Professor Name: {lecture['Professor Name']}")
-            print(f"Corp: {lecture['Corp']}")
+            print(f"Course Name: {lecture.course_name}")
+            print(f"Time: {lecture.time}")
+            print(f"Professor Name: {lecture.professor_name}")
+            print(f"Corp: {lecture.corp_name}")
             print("-" * 40)
 
 if __name__ == "__main__":
@@ -110,5 +104,9 @@ if __name__ == "__main__":
         Lecture(name="Software Engineering", corp="Dr. Glassman Aaron", credit=4, professor="Dr. Shaun Murphy"  ,hpw=4),
         Lecture(name="Artificial Intelligence", corp="Dr. Park Alex", credit=4, professor="Dr. Clair Brown"  ,hpw=4),
     ]
-    schedule = create_schedule(lectures, class_config, break_config)
+    cache = ScheduleCache()
+    key = cache_key(lectures, class_config, break_config, engine="mytimetable")
+    schedule = cache.get_or_create(
+        key, lambda: create_schedule(lectures, class_config, break_config)
+    )
     print_schedule(schedule)
@@ -0,0 +1,115 @@
+def interval_mask(start, end):
+    """Bitmask with one bit set for every minute in [start, end)."""
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def fit_mask(free, duration):
+    """Keep bit m of `free` only if minutes m .. m+duration-1 are all free."""
+    fits = free
+    covered = 1
+    while covered < duration and fits:
+        step = min(covered, duration - covered)
+        fits &= fits >> step
+        covered += step
+    return fits
+
+
+def lowest_bit_from(mask, start):
+    """Position of the lowest set bit at or after `start`, or None."""
+    mask >>= start
+    if not mask:
+        return None
+    return start + (mask & -mask).bit_length() - 1
+
+
+class DayOccupancy:
+    """Minute-resolution occupancy of a single day stored as an int bitset.
+
+    Bit m is set when minute m is taken by a break or a placed lecture. The day
+    ends at `day_end`; minutes at or past it are never free.
+    """
+
+    __slots__ = ("busy", "day_end")
+
+    def __init__(self, day_end, busy=0):
+        self.day_end = day_end
+        self.busy = busy
+
+    def copy(self):
+        return DayOccupancy(self.day_end, self.busy)
+
+    def reserve(self, start, end):
+        """Mark [start, end) as taken."""
+        self.busy |= interval_mask(start, end)
+
+    def release(self, start, end):
+        """Mark [start, end) as free again."""
+        self.busy &= ~interval_mask(start, end)
+
+    def is_free(self, start, end):
+        """Check if the whole of [start, end) is free and inside the day."""
+        return end <= self.day_end and not self.busy & interval_mask(start, end)
+
+    def free_mask(self, extra_busy=0):
+        """Bitmask of free minutes, optionally also excluding `extra_busy`."""
+        return ~(self.busy | extra_busy) & interval_mask(0, self.day_end)
+
+    def next_free(self, start, duration, extra_busy=0):
+        """Earliest start >= `start` where `duration` free minutes fit, or None."""
+        fits = fit_mask(self.free_mask(extra_busy), duration)
+        return lowest_bit_from(fits, start)
+
+    def free_runs(self):
+        """Every maximal free interval of the day as (start, end) pairs."""
+        free = self.free_mask()
+        taken = ~free & interval_mask(0, self.day_end + 1)
+        runs = []
+        start = lowest_bit_from(free, 0)
+        while start is not None:
+            end = lowest_bit_from(taken, start)
+            runs.append((start, end))
+            start = lowest_bit_from(free, end)
+        return runs
+
+
+class ResourceIndex:
+    """Per-day minute bitmasks of every professor and room across all sections.
+
+    Sharing one index between create_schedule calls keeps a professor or room
+    from being booked twice at the same time in different sections. Checking a
+    candidate slot costs a few integer operations however much is placed.
+    """
+
+    def __init__(self):
+        self.busy = {}
+
+    def keys(self, professor=None, room=None):
+        keys = []
+        if professor:
+            keys.append(("professor", professor))
+        if room:
+            keys.append(("room", room))
+        return keys
+
+    def mask(self, day, professor=None, room=None):
+        """Minutes of `day` in which the professor or the room is taken."""
+        busy = 0
+        for key in self.keys(professor, room):
+            busy |= self.busy.get(key, {}).get(day, 0)
+        return busy
+
+    def is_free(self, day, start, end, professor=None, room=None):
+        return not self.mask(day, professor, room) & interval_mask(start, end)
+
+    def reserve(self, day, start, end, professor=None, room=None):
+        for key in self.keys(professor, room):
+            days = self.busy.setdefault(key, {})
+            days[day] = days.get(day, 0) | interval_mask(start, end)
+
+    def release(self, day, start, end, professor=None, room=None):
+        for key in self.keys(professor, room):
+            days = self.busy.get(key)
+            if days and day in days:
+                days[day] &= ~interval_mask(start, end)
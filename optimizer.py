@@ -0,0 +1,356 @@
+import math
+import random
+import time
+
+from constraint_spec import blocked_masks, compile_masks, reserve_resources
+from occupancy import ResourceIndex, interval_mask
+from slots import build_slot_grid
+
+# How much a subject taught in two back to back slots costs for every
+# BREATHING_GAP setting in break.config.json
+BREATHING_GAP_WEIGHTS = {"NONE": 0, "RELAXED": 1, "NORMAL": 3, "STRICT": 10}
+
+
+class LocalSearch:
+    """Simulated annealing over the lecture slots of one schedule.
+
+    Lectures that sit exactly on a grid slot can move to a free slot or swap
+    with another lecture; labs, breaks and anything off the grid stay put. The
+    cost of a day only depends on that day's slots, so a move is scored by
+    re-costing the one or two days it touches. `blocked` ({day: minute
+    mask}) marks times no lecture may move into.
+    """
+
+    def __init__(
+        self, schedule, class_config, break_config, grid, resources=None, blocked=None
+    ):
+        self.schedule = schedule
+        self.grid = grid
+        self.resources = resources
+        self.days = list(schedule)
+        self.max_same = min(
+            class_config["MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY"],
+            class_config["MAX_LECTURES_PER_DAY"],
+        )
+        self.max_per_day = class_config["MAX_LECTURES_PER_DAY"]
+        self.breathing_weight = BREATHING_GAP_WEIGHTS.get(
+            break_config.get("BREATHING_GAP", "NORMAL"), 3
+        )
+
+        self.slots = {}
+        self.consecutive = {}
+        self.open = {}
+        blocked = blocked or {}
+        for day in self.days:
+            count = grid.slot_count(day)
+            self.slots[day] = [None] * count
+            self.consecutive[day] = [grid.consecutive(day, i) for i in range(count)]
+            self.open[day] = [
+                not blocked.get(day, 0) & interval_mask(*grid.slot(day, i))
+                for i in range(count)
+            ]
+
+        # Every movable lecture as [placement, day, slot index], and the day
+        # whose list in the schedule holds it
+        self.entries = []
+        self.listed_on = []
+        self.same_day = {}
+        self.day_lectures = dict.fromkeys(self.days, 0)
+        for day, placements in schedule.items():
+            for placement in placements:
+                if placement.kind == "break":
+                    continue
+                if placement.kind == "lecture":
+                    self.day_lectures[day] += 1
+                index = grid.slot_index(day, placement.start)
+                movable = (
+                    placement.kind == "lecture"
+                    and index is not None
+                    and grid.slot(day, index)[1] == placement.end
+                )
+                if movable:
+                    self.slots[day][index] = placement
+                    self.entries.append([placement, day, index])
+                    self.listed_on.append(day)
+                    key = (placement.course, day)
+                    self.same_day[key] = self.same_day.get(key, 0) + 1
+                else:
+                    # Fixed blocks still fill every slot they overlap
+                    for i, (start, end) in enumerate(grid.slots["lecture"][day]):
+                        if start < placement.end and end > placement.start:
+                            self.slots[day][i] = placement
+
+        self.day_cost = {day: self.cost_of_day(day) for day in self.days}
+
+    def cost_of_day(self, day):
+        """Daily balance, idle slots and breathing gaps of one day.
+
+        Balance counts lectures only, so a lab does not push lectures off its
+        day.
+        """
+        slots = self.slots[day]
+        taken = [i for i, placement in enumerate(slots) if placement is not None]
+        if not taken:
+            return 0
+        idle = taken[-1] - taken[0] + 1 - len(taken)
+        back_to_back = 0
+        consecutive = self.consecutive[day]
+        for i in range(len(slots) - 1):
+            first, second = slots[i], slots[i + 1]
+            if (
+                consecutive[i]
+                and first is not None
+                and second is not None
+                and first is not second
+                and first.course == second.course
+            ):
+                back_to_back += 1
+        return (
+            self.day_lectures[day] ** 2
+            + 2 * idle
+            + self.breathing_weight * back_to_back
+        )
+
+    def total_cost(self):
+        return sum(self.day_cost.values())
+
+    def count_move(self, course, old_day, new_day):
+        self.same_day[(course, old_day)] -= 1
+        key = (course, new_day)
+        self.same_day[key] = self.same_day.get(key, 0) + 1
+
+    def place(self, entry, day, index):
+        placement = entry[0]
+        self.slots[entry[1]][entry[2]] = None
+        self.count_move(placement.course, entry[1], day)
+        self.day_lectures[entry[1]] -= 1
+        self.day_lectures[day] += 1
+        entry[1], entry[2] = day, index
+        self.slots[day][index] = placement
+
+    def resources_free(self, placement, day, index):
+        if self.resources is None:
+            return True
+        start, end = self.grid.slot(day, index)
+        return self.resources.is_free(
+            day, start, end, placement.professor_name, placement.room_name
+        )
+
+    def release(self, entry):
+        if self.resources is not None:
+            placement = entry[0]
+            start, end = self.grid.slot(entry[1], entry[2])
+            self.resources.release(
+                entry[1], start, end, placement.professor_name, placement.room_name
+            )
+
+    def reserve(self, entry):
+        if self.resources is not None:
+            placement = entry[0]
+            start, end = self.grid.slot(entry[1], entry[2])
+            self.resources.reserve(
+                entry[1], start, end, placement.professor_name, placement.room_name
+            )
+
+    def try_move(self, entry, day, index, temperature, rng):
+        """Move one lecture to a free slot if the annealing rule accepts it."""
+        placement, old_day, old_index = entry
+        if self.slots[day][index] is not None or not self.open[day][index]:
+            return False
+        if day != old_day:
+            if self.same_day.get((placement.course, day), 0) >= self.max_same:
+                return False
+            if self.day_lectures[day] >= self.max_per_day:
+                return False
+        self.release(entry)
+        if not self.resources_free(placement, day, index):
+            self.reserve(entry)
+            return False
+
+        touched = {old_day, day}
+        before = sum(self.day_cost[d] for d in touched)
+        self.place(entry, day, index)
+        after = {d: self.cost_of_day(d) for d in touched}
+        delta = sum(after.values()) - before
+        if accept(delta, temperature, rng):
+            self.day_cost.update(after)
+            self.reserve(entry)
+            return True
+        self.place(entry, old_day, old_index)
+        self.reserve(entry)
+        return False
+
+    def try_swap(self, first, second, temperature, rng):
+        """Swap the slots of two lectures if the annealing rule accepts it."""
+        a, day_a, index_a = first
+        b, day_b, index_b = second
+        if a.course == b.course:
+            return False
+        if not (self.open[day_a][index_a] and self.open[day_b][index_b]):
+            return False
+        if day_a != day_b:
+            if self.same_day.get((a.course, day_b), 0) >= self.max_same:
+                return False
+            if self.same_day.get((b.course, day_a), 0) >= self.max_same:
+                return False
+        self.release(first)
+        self.release(second)
+        if not (
+            self.resources_free(a, day_b, index_b)
+            and self.resources_free(b, day_a, index_a)
+        ):
+            self.reserve(first)
+            self.reserve(second)
+            return False
+
+        touched = {day_a, day_b}
+        before = sum(self.day_cost[d] for d in touched)
+        self.swap(first, second)
+        after = {d: self.cost_of_day(d) for d in touched}
+        delta = sum(after.values()) - before
+        if not accept(delta, temperature, rng):
+            self.swap(first, second)
+            self.reserve(first)
+            self.reserve(second)
+            return False
+        self.day_cost.update(after)
+        self.reserve(first)
+        self.reserve(second)
+        return True
+
+    def swap(self, first, second):
+        day_a, index_a = first[1], first[2]
+        day_b, index_b = second[1], second[2]
+        self.count_move(first[0].course, day_a, day_b)
+        self.count_move(second[0].course, day_b, day_a)
+        first[1], first[2] = day_b, index_b
+        second[1], second[2] = day_a, index_a
+        self.slots[day_b][index_b] = first[0]
+        self.slots[day_a][index_a] = second[0]
+
+    def snapshot(self):
+        return [(entry[1], entry[2]) for entry in self.entries]
+
+    def write_back(self, positions):
+        """Move every placement of the schedule to its slot in `positions`."""
+        for i, (day, index) in enumerate(positions):
+            entry = self.entries[i]
+            placement = entry[0]
+            start, end = self.grid.slot(day, index)
+            if self.listed_on[i] != day:
+                self.schedule[self.listed_on[i]].remove(placement)
+                self.schedule[day].append(placement)
+                self.listed_on[i] = day
+            placement.start, placement.end = start, end
+            entry[1], entry[2] = day, index
+
+    def run(
+        self,
+        time_limit=1.0,
+        max_iterations=None,
+        seed=None,
+        start_temperature=5.0,
+        end_temperature=0.05,
+    ):
+        """Anneal for `time_limit` seconds and keep the best schedule found."""
+        rng = random.Random(seed)
+        stats = {"initial_cost": self.total_cost(), "iterations": 0, "accepted": 0}
+        best_cost = stats["initial_cost"]
+        best = self.snapshot()
+        weekly_slots = self.grid.weekly_slots()
+        if not self.entries:
+            stats["final_cost"] = best_cost
+            return stats
+
+        started = time.perf_counter()
+        temperature = start_temperature
+        while max_iterations is None or stats["iterations"] < max_iterations:
+            if stats["iterations"] % 64 == 0:
+                elapsed = time.perf_counter() - started
+                if elapsed >= time_limit:
+                    break
+                progress = elapsed / time_limit if time_limit else 1
+                temperature = start_temperature * (
+                    end_temperature / start_temperature
+                ) ** progress
+            stats["iterations"] += 1
+
+            entry = rng.choice(self.entries)
+            if rng.random() < 0.5:
+                day, index = rng.choice(weekly_slots)
+                accepted = self.try_move(entry, day, index, temperature, rng)
+            else:
+                other = rng.choice(self.entries)
+                accepted = other is not entry and self.try_swap(
+                    entry, other, temperature, rng
+                )
+            if accepted:
+                stats["accepted"] += 1
+                cost = self.total_cost()
+                if cost < best_cost:
+                    best_cost = cost
+                    best = self.snapshot()
+
+        if self.resources is not None:
+            for entry in self.entries:
+                self.release(entry)
+        self.write_back(best)
+        if self.resources is not None:
+            for entry in self.entries:
+                self.reserve(entry)
+        stats["final_cost"] = best_cost
+        return stats
+
+
+def accept(delta, temperature, rng):
+    """Metropolis rule: always take improvements, sometimes take worse moves."""
+    if delta <= 0:
+        return True
+    if temperature <= 0:
+        return False
+    return rng.random() < math.exp(-delta / temperature)
+
+
+def improve_schedule(
+    schedule,
+    class_config,
+    break_config,
+    grid=None,
+    resources=None,
+    time_limit=1.0,
+    max_iterations=None,
+    seed=None,
+    constraints=None,
+):
+    """Improve a finished schedule in place for at most `time_limit` seconds.
+
+    Hard limits (free slots, MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY,
+    MAX_LECTURES_PER_DAY, professors and rooms in `resources`) are kept;
+    daily balance, idle slots and the BREATHING_GAP setting are optimised.
+    `constraints` (constraint_spec rules) keep lectures out of blocked times
+    and away from unavailable professors and rooms. Returns the search
+    statistics.
+    """
+    if grid is None:
+        grid = build_slot_grid(class_config, break_config)
+    blocked = None
+    if constraints:
+        masks = compile_masks(constraints, list(schedule))
+        blocked = blocked_masks(masks)
+        if resources is None:
+            resources = ResourceIndex()
+            for day, placements in schedule.items():
+                for placement in placements:
+                    if placement.kind != "break":
+                        resources.reserve(
+                            day,
+                            placement.start,
+                            placement.end,
+                            placement.professor_name,
+                            placement.room_name,
+                        )
+        reserve_resources(masks, resources)
+    search = LocalSearch(
+        schedule, class_config, break_config, grid, resources, blocked
+    )
+    return search.run(time_limit, max_iterations, seed)
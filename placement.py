@@ -0,0 +1,178 @@
+def minutes_to_time(m):
+    """Convert minutes back to HH:MM format."""
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+class NamePool:
+    """Interns names so every placement stores a small integer id instead."""
+
+    __slots__ = ("names", "ids")
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+
+    def intern(self, name):
+        """Return the id for `name`, adding it to the pool if needed."""
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.ids[name] = name_id
+        return name_id
+
+    def name(self, name_id):
+        return self.names[name_id]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class Placement:
+    """A single scheduled block with integer minutes and interned names.
+
+    `kind` is "lecture", "lab" or "break"; `room` is an interned id or None.
+
+    Strings are only built when asked for. Indexing with the old dictionary keys
+    ("Course Name", "Time", "Professor Name", "Corp") still works.
+    """
+
+    __slots__ = (
+        "start",
+        "end",
+        "course",
+        "professor",
+        "corp",
+        "pool",
+        "kind",
+        "room",
+    )
+
+    def __init__(
+        self, start, end, course, professor, corp, pool, kind="lecture", room=None
+    ):
+        self.start = start
+        self.end = end
+        self.course = course
+        self.professor = professor
+        self.corp = corp
+        self.pool = pool
+        self.kind = kind
+        self.room = room
+
+    @property
+    def course_name(self):
+        return self.pool.names[self.course]
+
+    @property
+    def professor_name(self):
+        return self.pool.names[self.professor]
+
+    @property
+    def corp_name(self):
+        return self.pool.names[self.corp]
+
+    @property
+    def room_name(self):
+        return None if self.room is None else self.pool.names[self.room]
+
+    @property
+    def time(self):
+        return f"{minutes_to_time(self.start)}-{minutes_to_time(self.end)}"
+
+    def __getitem__(self, key):
+        if key == "Course Name":
+            return self.course_name
+        elif key == "Time":
+            return self.time
+        elif key == "Professor Name":
+            return self.professor_name
+        elif key == "Corp":
+            return self.corp_name
+        raise KeyError(key)
+
+    def __repr__(self):
+        return f"Placement({self.time} {self.course_name!r})"
+
+
+class Schedule(dict):
+    """Weekly schedule mapping each day to a list of placements.
+
+    All placements share one name pool, so each course, professor and corp
+    string is stored once no matter how often it is scheduled. `unplaced`
+    lists the hours and labs a scheduler could not fit, as dicts with course,
+    kind and count.
+    """
+
+    def __init__(self, days, pool=None):
+        super().__init__((day, []) for day in days)
+        self.pool = pool if pool is not None else NamePool()
+        self.unplaced = []
+
+    def add(
+        self,
+        day,
+        start,
+        end,
+        course_name,
+        professor_name,
+        corp,
+        kind="lecture",
+        room=None,
+    ):
+        """Append a placement to `day` and return it."""
+        intern = self.pool.intern
+        placement = Placement(
+            start,
+            end,
+            intern(course_name),
+            intern(professor_name),
+            intern(corp),
+            self.pool,
+            kind,
+            None if room is None else intern(room),
+        )
+        self[day].append(placement)
+        return placement
+
+    def sorted_day(self, day):
+        """Placements of `day` in start time order."""
+        return sorted(self[day], key=lambda placement: placement.start)
+
+    def to_dict(self):
+        """Plain data form: the name pool once and every placement as a row."""
+        return {
+            "days": list(self),
+            "names": list(self.pool.names),
+            "placements": {
+                day: [
+                    [
+                        placement.start,
+                        placement.end,
+                        placement.course,
+                        placement.professor,
+                        placement.corp,
+                        placement.kind,
+                        placement.room,
+                    ]
+                    for placement in placements
+                ]
+                for day, placements in self.items()
+            },
+            "unplaced": self.unplaced,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a schedule written by to_dict()."""
+        pool = NamePool()
+        for name in data["names"]:
+            pool.intern(name)
+        schedule = cls(data["days"], pool)
+        for day, rows in data["placements"].items():
+            schedule[day] = [
+                Placement(start, end, course, professor, corp, pool, kind, room)
+                for start, end, course, professor, corp, kind, room in rows
+            ]
+        schedule.unplaced = data.get("unplaced", [])
+        return schedule
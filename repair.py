@@ -0,0 +1,284 @@
+import copy
+
+from config import parse_break_times, time_to_minutes
+from constraint_spec import blocked_masks, compile_masks, reserve_resources
+from occupancy import interval_mask
+from Scheduler import build_day_occupancy
+from slots import build_slot_grid
+
+
+def with_extra_breaks(break_config, timings):
+    """Copy of `break_config` with the "HH:MM-HH:MM" `timings` added as breaks."""
+    if not timings:
+        return break_config
+    break_config = copy.deepcopy(break_config)
+    break_config["Breaks"]["EXTRA"] = {
+        "name": "Extra Break",
+        "total": len(timings),
+        "duration": 0,
+        "timeing": list(timings),
+    }
+    return break_config
+
+
+def parse_unavailable(entries):
+    """Turn unavailability entries into (professor, day, start, end) minutes.
+
+    Each entry is (professor, day) for the whole day or (professor, day,
+    "HH:MM-HH:MM") for part of it.
+    """
+    unavailable = []
+    for entry in entries:
+        professor, day = entry[0], entry[1]
+        if len(entry) > 2:
+            start_time, end_time = entry[2].split("-")
+            start, end = time_to_minutes(start_time), time_to_minutes(end_time)
+        else:
+            start, end = 0, 24 * 60
+        unavailable.append((professor, day, start, end))
+    return unavailable
+
+
+def describe(day, placement):
+    return {"course": placement.course_name, "day": day, "time": placement.time}
+
+
+def repair_schedule(
+    schedule,
+    lectures,
+    class_config,
+    break_config,
+    changes,
+    resources=None,
+    constraints=None,
+):
+    """Apply a change set to a finished schedule, moving as little as possible.
+
+    `changes` may hold:
+      "breaks": new "HH:MM-HH:MM" breaks for every day,
+      "unavailable": (professor, day[, "HH:MM-HH:MM"]) entries,
+      "hpw": {course name: new hours per week}.
+
+    Only placements hit by a change are released. Each one is put back in the
+    free slot closest to where it was, trying its own day first, on a day
+    still under MAX_LECTURES_PER_DAY for lectures. The schedule
+    (and `resources`, when given) is updated in place and a diff of what was
+    moved, removed, added or could not be placed is returned. `lectures` is
+    only read: an "hpw" change does not touch the Lecture objects, so callers
+    that keep them update their hours themselves.
+
+    `constraints` (constraint_spec rules) are honoured like the change set:
+    placements that break them are moved and nothing is put back where they
+    forbid it.
+    """
+    extra_breaks = changes.get("breaks", [])
+    break_config = with_extra_breaks(break_config, extra_breaks)
+    grid = build_slot_grid(class_config, break_config)
+    days = list(schedule)
+    max_same = class_config["MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY"]
+    max_per_day = class_config["MAX_LECTURES_PER_DAY"]
+    occupancy = build_day_occupancy(
+        days,
+        parse_break_times(break_config),
+        time_to_minutes(class_config["START_TIME"]),
+        time_to_minutes(class_config["END_TIME"]),
+    )
+    unavailable = parse_unavailable(changes.get("unavailable", []))
+    blocked = {}
+    for professor, day, start, end in unavailable:
+        mask = interval_mask(start, end)
+        blocked[(professor, day)] = blocked.get((professor, day), 0) | mask
+    room_blocked = {}
+    closed = {}
+    masks = {}
+    if constraints:
+        masks = compile_masks(constraints, days)
+        closed = blocked_masks(masks)
+        for (target, name), by_day in masks.items():
+            into = {"professor": blocked, "room": room_blocked}.get(target)
+            if into is None:
+                continue
+            for day, mask in by_day.items():
+                into[(name, day)] = into.get((name, day), 0) | mask
+
+    new_breaks = [
+        (time_to_minutes(start_time), time_to_minutes(end_time))
+        for start_time, end_time in (timing.split("-") for timing in extra_breaks)
+    ]
+    new_break_mask = 0
+    for start, end in new_breaks:
+        new_break_mask |= interval_mask(start, end)
+
+    diff = {"moved": [], "removed": [], "added": [], "unplaced": []}
+    by_name = {lecture.course_name: lecture for lecture in lectures}
+    same_day = {}
+    # Lectures of the section on each day, capped at MAX_LECTURES_PER_DAY
+    day_lectures = dict.fromkeys(days, 0)
+    released = []
+
+    def release(day, placement):
+        schedule[day].remove(placement)
+        if placement.kind == "lecture":
+            same_day[(placement.course_name, day)] -= 1
+            day_lectures[day] -= 1
+        if resources is not None:
+            resources.release(
+                day,
+                placement.start,
+                placement.end,
+                placement.professor_name,
+                placement.room_name,
+            )
+
+    # Keep everything that is not hit by a change exactly where it is
+    for day, placements in schedule.items():
+        for placement in list(placements):
+            if placement.kind == "break":
+                continue
+            if placement.kind == "lecture":
+                key = (placement.course_name, day)
+                same_day[key] = same_day.get(key, 0) + 1
+                day_lectures[day] += 1
+            mask = interval_mask(placement.start, placement.end)
+            busy = (
+                new_break_mask
+                | closed.get(day, 0)
+                | blocked.get((placement.professor_name, day), 0)
+                | room_blocked.get((placement.room_name, day), 0)
+            )
+            if busy & mask:
+                released.append((day, placement))
+            else:
+                occupancy[day].reserve(placement.start, placement.end)
+    for day, placement in released:
+        release(day, placement)
+    if resources is not None:
+        # Releasing cleared these minutes too; keep the professors and rooms
+        # busy for every later scheduling call
+        for professor, day, start, end in unavailable:
+            resources.reserve(day, start, end, professor)
+        reserve_resources(masks, resources)
+
+    for day in days:
+        for start, end in new_breaks:
+            schedule.add(day, start, end, "Break", "", "Break", kind="break")
+
+    # Hours per week changes drop surplus lectures or ask for new ones
+    to_place = [(day, placement) for day, placement in released]
+    new_hours = []
+    for course_name, hpw in changes.get("hpw", {}).items():
+        lecture = by_name[course_name]
+        placed = [
+            (day, placement)
+            for day, placements in schedule.items()
+            for placement in placements
+            if placement.kind == "lecture" and placement.course_name == course_name
+        ]
+        waiting = [
+            item
+            for item in to_place
+            if item[1].kind == "lecture" and item[1].course_name == course_name
+        ]
+        surplus = len(placed) + len(waiting) - hpw
+        # Drop lectures still waiting first, then from the busiest days
+        while surplus > 0 and waiting:
+            day, placement = waiting.pop()
+            to_place.remove((day, placement))
+            diff["removed"].append(describe(day, placement))
+            surplus -= 1
+        placed.sort(key=lambda item: same_day[(course_name, item[0])])
+        while surplus > 0 and placed:
+            day, placement = placed.pop()
+            release(day, placement)
+            occupancy[day].release(placement.start, placement.end)
+            diff["removed"].append(describe(day, placement))
+            surplus -= 1
+        new_hours.extend([lecture] * -surplus)
+
+    def place(origin_day, origin, kind, course_name, professor, room, corp):
+        """Put one session in the free slot nearest to its old position."""
+        if origin_day is None:
+            order = days
+            origin_start = 0
+        else:
+            first = days.index(origin_day)
+            order = sorted(
+                days,
+                key=lambda day: min(
+                    (days.index(day) - first) % len(days),
+                    (first - days.index(day)) % len(days),
+                ),
+            )
+            origin_start = origin.start
+        for day in order:
+            if kind == "lecture" and (
+                same_day.get((course_name, day), 0) >= max_same
+                or day_lectures[day] >= max_per_day
+            ):
+                continue
+            taken = (
+                closed.get(day, 0)
+                | blocked.get((professor, day), 0)
+                | room_blocked.get((room, day), 0)
+            )
+            if resources is not None:
+                taken |= resources.mask(day, professor, room)
+            candidates = sorted(
+                grid.slots[kind][day], key=lambda slot: abs(slot[0] - origin_start)
+            )
+            for start, end in candidates:
+                if taken & interval_mask(start, end):
+                    continue
+                if not occupancy[day].is_free(start, end):
+                    continue
+                occupancy[day].reserve(start, end)
+                if resources is not None:
+                    resources.reserve(day, start, end, professor, room)
+                if kind == "lecture":
+                    key = (course_name, day)
+                    same_day[key] = same_day.get(key, 0) + 1
+                    day_lectures[day] += 1
+                return day, schedule.add(
+                    day, start, end, course_name, professor, corp, kind, room
+                )
+        return None
+
+    for origin_day, item in to_place:
+        found = place(
+            origin_day,
+            item,
+            item.kind,
+            item.course_name,
+            item.professor_name,
+            item.room_name,
+            item.corp_name,
+        )
+        if found is None:
+            diff["unplaced"].append(describe(origin_day, item))
+        else:
+            day, placement = found
+            diff["moved"].append(
+                {
+                    "course": item.course_name,
+                    "from_day": origin_day,
+                    "from_time": item.time,
+                    "to_day": day,
+                    "to_time": placement.time,
+                }
+            )
+    # Brand new lectures for a raised hpw
+    for lecture in new_hours:
+        found = place(
+            None,
+            None,
+            "lecture",
+            lecture.course_name,
+            lecture.professor,
+            getattr(lecture, "room", None),
+            lecture.course_name,
+        )
+        if found is None:
+            diff["unplaced"].append({"course": lecture.course_name})
+        else:
+            diff["added"].append(describe(*found))
+    return diff
@@ -0,0 +1,317 @@
+import argparse
+import copy
+import itertools
+import json
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from capacity import InfeasibleScheduleError
+from config import load_config
+from slots import build_slot_grid
+
+# Set once per worker process by init_worker(), so the lectures (or CP-SAT
+# instance) and base configs are pickled once per worker, not once per task
+shared = {}
+
+# Config keys the CP-SAT model reads, all through the slot grid. The model
+# has no per-day caps, so any other override would change nothing
+CPSAT_KEYS = {
+    "class": {
+        "DAYS",
+        "LECTURE_TIME_SLOTS",
+        "LECTURE_DURATION",
+        "LAB_DURATION",
+        "START_TIME",
+        "END_TIME",
+    },
+    "break": {"Breaks", "GAP_TIME_BETWEEN_LECTURES"},
+}
+
+
+def expand_scenarios(grid):
+    """Every combination of a {path: [values]} override grid, in order.
+
+    Paths start with "class." or "break." followed by dotted keys into that
+    config, e.g. "class.MAX_LECTURES_PER_DAY" or
+    "break.Breaks.LUNCH.timeing".
+    """
+    paths = list(grid)
+    return [
+        dict(zip(paths, values))
+        for values in itertools.product(*(grid[path] for path in paths))
+    ]
+
+
+def apply_overrides(class_config, break_config, overrides):
+    """Copies of the configs with the `overrides` of one scenario applied."""
+    configs = {
+        "class": copy.deepcopy(class_config),
+        "break": copy.deepcopy(break_config),
+    }
+    for path, value in overrides.items():
+        which, *keys = path.split(".")
+        if which not in configs or not keys:
+            raise ValueError(f"Override {path!r} must start with class. or break.")
+        target = configs[which]
+        for key in keys[:-1]:
+            target = target[key]
+        target[keys[-1]] = value
+    return configs["class"], configs["break"]
+
+
+def unsupported_overrides(paths, engine):
+    """Override paths the `engine` ignores (only CP-SAT ignores any)."""
+    if engine != "cpsat":
+        return []
+    unsupported = []
+    for path in paths:
+        which, _, rest = path.partition(".")
+        if rest.split(".")[0] not in CPSAT_KEYS.get(which, ()):
+            unsupported.append(path)
+    return unsupported
+
+
+def day_balance(counts):
+    """Population standard deviation of per-day lecture counts (0 = even)."""
+    return statistics.pstdev(counts) if counts else 0.0
+
+
+def run_greedy(lectures, class_config, break_config):
+    from Scheduler import create_schedule
+    from validator import validate_schedule
+
+    grid = build_slot_grid(class_config, break_config)
+    try:
+        schedule = create_schedule(lectures, class_config, break_config, grid)
+    except InfeasibleScheduleError as error:
+        return {"feasible": False, "reason": str(error)}
+    per_day = [
+        sum(1 for placement in schedule[day] if placement.kind == "lecture")
+        for day in grid.days
+    ]
+    lab_slots = sum(
+        1
+        for day in grid.days
+        for placement in schedule[day]
+        if placement.kind == "lab"
+        for start, end in grid.slots["lecture"][day]
+        if start < placement.end and end > placement.start
+    )
+    weekly_slots = len(grid.weekly_slots())
+    unplaced = sum(item["count"] for item in schedule.unplaced)
+    violations = validate_schedule(schedule, class_config, break_config, lectures)
+    return {
+        "feasible": not unplaced and not violations,
+        "unplaced": unplaced,
+        "violations": len(violations),
+        "utilization": (sum(per_day) + lab_slots) / weekly_slots if weekly_slots else 0,
+        "balance": day_balance(per_day),
+        "max_per_day": max(per_day, default=0),
+    }
+
+
+def run_cpsat(instance, class_config, break_config, time_limit):
+    import test as cpsat
+
+    grid = build_slot_grid(class_config, break_config)
+    model, schedule, _ = cpsat.build_model(instance, grid)
+    _, timetable = cpsat.solve(
+        model, schedule, workers=1, time_limit=time_limit, on_solution=None
+    )
+    if not timetable:
+        return {"feasible": False, "reason": "no timetable found"}
+    weekly_slots = grid.weekly_slots()
+    sections = {
+        (dept, sem)
+        for dept in instance['subjects']
+        for sem in instance['semesters']
+    }
+    per_day = {}
+    for dept, sem, _, _, time in timetable:
+        key = (dept, sem, weekly_slots[time][0])
+        per_day[key] = per_day.get(key, 0) + 1
+    counts = [
+        per_day.get((dept, sem, day), 0)
+        for dept, sem in sections
+        for day in grid.days
+    ]
+    return {
+        "feasible": True,
+        "unplaced": 0,
+        "violations": 0,
+        "utilization": len(timetable) / (len(weekly_slots) * len(sections)),
+        "balance": day_balance(counts),
+        "max_per_day": max(counts, default=0),
+    }
+
+
+def init_worker(payload, class_config, break_config, engine, time_limit):
+    shared.update(
+        payload=payload,
+        class_config=class_config,
+        break_config=break_config,
+        engine=engine,
+        time_limit=time_limit,
+    )
+
+
+def run_scenario(overrides):
+    """Run the shared lectures under one scenario's configs."""
+    try:
+        class_config, break_config = apply_overrides(
+            shared["class_config"], shared["break_config"], overrides
+        )
+        if shared["engine"] == "cpsat":
+            result = run_cpsat(
+                shared["payload"], class_config, break_config, shared["time_limit"]
+            )
+        else:
+            result = run_greedy(shared["payload"], class_config, break_config)
+    except (KeyError, ValueError, TypeError) as error:
+        result = {"feasible": False, "reason": f"{type(error).__name__}: {error}"}
+    return {"overrides": overrides, **result}
+
+
+def sweep(
+    payload,
+    class_config,
+    break_config,
+    grid,
+    engine="greedy",
+    processes=None,
+    time_limit=10.0,
+):
+    """Run every scenario of an override `grid` in a process pool.
+
+    `payload` is the list of lectures for the greedy engine or a test.py
+    instance for "cpsat". It is sent to each worker once through the pool
+    initializer. Returns one result dict per scenario in grid order. Raises
+    ValueError for overrides the engine would silently ignore.
+    """
+    unsupported = unsupported_overrides(grid, engine)
+    if unsupported:
+        raise ValueError(
+            f"Not supported with --engine {engine}: {', '.join(unsupported)}"
+        )
+    scenarios = expand_scenarios(grid)
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=init_worker,
+        initargs=(payload, class_config, break_config, engine, time_limit),
+    ) as pool:
+        return list(pool.map(run_scenario, scenarios))
+
+
+def format_table(results):
+    """Plain text comparison table, one row per scenario."""
+    headers = [
+        "scenario",
+        "feasible",
+        "unplaced",
+        "violations",
+        "util",
+        "balance",
+        "max/day",
+        "note",
+    ]
+    rows = []
+    for result in results:
+        scenario = ", ".join(
+            f"{path}={json.dumps(value)}" for path, value in result["overrides"].items()
+        )
+        if "utilization" not in result:
+            rows.append(
+                [scenario or "base", "no", "", "", "", "", "", result["reason"]]
+            )
+            continue
+        rows.append(
+            [
+                scenario or "base",
+                "yes" if result["feasible"] else "no",
+                str(result["unplaced"]),
+                str(result["violations"]),
+                f"{result['utilization']:.0%}",
+                f"{result['balance']:.2f}",
+                str(result["max_per_day"]),
+                "",
+            ]
+        )
+    widths = [
+        max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))
+    ]
+    lines = [
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in [headers] + rows
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def parse_set(text):
+    """Turn "PATH=VALUE" into (path, [values]); a JSON list gives several."""
+    path, _, value = text.partition("=")
+    try:
+        value = json.loads(value)
+    except json.JSONDecodeError:
+        pass  # A bare string
+    return path, value if isinstance(value, list) else [value]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare config what-if scenarios.")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="PATH=VALUES",
+        help='override, e.g. class.MAX_LECTURES_PER_DAY=[5,6] or '
+        'break.Breaks.LUNCH.timeing=[["12:30-13:30"],["13:05-14:10"]]',
+    )
+    parser.add_argument("--grid", help="JSON file with a {path: [values]} grid")
+    parser.add_argument(
+        "--lectures", help="CSV or JSON lecture catalogue (default: demo section)"
+    )
+    parser.add_argument("--engine", choices=["greedy", "cpsat"], default="greedy")
+    parser.add_argument("--processes", type=int, help="worker processes")
+    parser.add_argument(
+        "--time-limit", type=float, default=10.0, help="CP-SAT budget per scenario"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid:
+        with open(args.grid) as f:
+            grid.update(json.load(f))
+    grid.update(parse_set(text) for text in args.set)
+
+    if args.engine == "cpsat":
+        import test as cpsat
+
+        payload = cpsat.sample_instance()
+    elif args.lectures:
+        from lecture_store import load_lectures
+
+        payload = list(load_lectures(args.lectures))
+    else:
+        from Scheduler import sample_lectures
+
+        payload = sample_lectures()
+
+    class_config, break_config = load_config()
+    try:
+        results = sweep(
+            payload,
+            class_config,
+            break_config,
+            grid,
+            args.engine,
+            args.processes,
+            args.time_limit,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_table(results))
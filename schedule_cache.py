@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from placement import Schedule
+
+# Bump when the stored format or the scheduling rules change so that old
+# entries stop matching
+CACHE_VERSION = 2
+
+
+def lecture_record(lecture):
+    """Everything about a lecture that affects its placement."""
+    return {
+        "name": lecture.course_name,
+        "corp": lecture.corp,
+        "credit": lecture.credit,
+        "professor": lecture.professor,
+        "hpw": lecture.hpw,
+        "labs_per_week": getattr(lecture, "labs_per_week", 0),
+        "room": getattr(lecture, "room", None),
+    }
+
+
+def cache_key(
+    lectures, class_config, break_config, engine="Scheduler", constraints=None
+):
+    """Canonical hash of the lecture set, both configs, the constraint rules
+    and the engine used."""
+    payload = {
+        "version": CACHE_VERSION,
+        "engine": engine,
+        "lectures": [lecture_record(lecture) for lecture in lectures],
+        "class_config": class_config,
+        "break_config": break_config,
+    }
+    if constraints:
+        # Left out when empty so existing entries keep their keys
+        payload["constraints"] = constraints
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ScheduleCache:
+    """On-disk schedule store keyed by cache_key().
+
+    Every schedule is one JSON file. When the directory grows past
+    `max_bytes` the least recently used entries are removed. Hit and miss
+    counts are kept in stats.json next to the entries.
+    """
+
+    def __init__(self, directory=".schedule_cache", max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.stats_path = os.path.join(directory, "stats.json")
+        try:
+            with open(self.stats_path) as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError):
+            self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def save_stats(self):
+        self.write(self.stats_path, self.stats)
+
+    def write(self, path, data):
+        """Write JSON atomically so a crashed run never leaves half a file.
+
+        Every writer gets its own temporary file, so processes sharing the
+        cache never write into each other's.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def get(self, key):
+        """Stored schedule for `key`, or None on a miss."""
+        path = self.path(key)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            self.save_stats()
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            pass  # Evicted by another process since it was read
+        self.stats["hits"] += 1
+        self.save_stats()
+        return Schedule.from_dict(data)
+
+    def put(self, key, schedule):
+        self.write(self.path(key), schedule.to_dict())
+        self.evict()
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json") or name == "stats.json":
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits `max_bytes`."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass  # Another process evicted it first
+            total -= size
+            self.stats["evictions"] += 1
+        self.save_stats()
+
+    def get_or_create(self, key, create):
+        """Stored schedule for `key`, or call `create()` and store its result."""
+        schedule = self.get(key)
+        if schedule is None:
+            schedule = create()
+            self.put(key, schedule)
+        return schedule
@@ -0,0 +1,141 @@
+from config import parse_break_times, time_to_minutes
+from occupancy import fit_mask, lowest_bit_from
+from placement import minutes_to_time
+
+
+def overlaps_break(start, end, breaks):
+    """Return the latest end of the breaks that [start, end) runs into, or None."""
+    hit = None
+    for break_start, break_end in breaks:
+        if start < break_end and end > break_start:
+            hit = break_end if hit is None else max(hit, break_end)
+    return hit
+
+
+def lecture_slot_times(class_config, breaks, gap_between_lectures):
+    """Work out the (start, end) of every lecture slot in one day."""
+    duration = class_config["LECTURE_DURATION"]
+    if class_config.get("LECTURE_TIME_SLOTS"):
+        slots = []
+        for timing in class_config["LECTURE_TIME_SLOTS"]:
+            start_time, end_time = timing.split("-")
+            slots.append((time_to_minutes(start_time), time_to_minutes(end_time)))
+        return sorted(slots)
+
+    slots = []
+    current_time = time_to_minutes(class_config["START_TIME"])
+    class_end_time = time_to_minutes(class_config["END_TIME"])
+    while current_time + duration <= class_end_time:
+        break_end = overlaps_break(current_time, current_time + duration, breaks)
+        if break_end is not None:
+            current_time = break_end
+            continue
+        slots.append((current_time, current_time + duration))
+        current_time += duration + gap_between_lectures
+    return slots
+
+
+def lab_slot_times(lecture_slots, lab_duration, breaks, class_end_time):
+    """Lab slots start with a lecture slot and must not run into a break."""
+    slots = []
+    for start, _ in lecture_slots:
+        end = start + lab_duration
+        if end <= class_end_time and overlaps_break(start, end, breaks) is None:
+            slots.append((start, end))
+    return slots
+
+
+class SlotGrid:
+    """Legal lecture and lab slots for every day, compiled once from the configs.
+
+    Slots of a kind ("lecture" or "lab") are numbered per day in start time
+    order, so a placement can be stored as (day, kind, index).
+    """
+
+    def __init__(self, days, slots, durations, gap_between_lectures=0):
+        self.days = days
+        self.slots = slots
+        self.durations = durations
+        self.gap_between_lectures = gap_between_lectures
+        self.index = {}
+        self.start_masks = {}
+        for kind, slots_by_day in slots.items():
+            self.index[kind] = {}
+            self.start_masks[kind] = {}
+            for day, day_slots in slots_by_day.items():
+                self.index[kind][day] = {
+                    start: i for i, (start, _) in enumerate(day_slots)
+                }
+                mask = 0
+                for start, _ in day_slots:
+                    mask |= 1 << start
+                self.start_masks[kind][day] = mask
+
+    def slot(self, day, index, kind="lecture"):
+        """(start, end) minutes of a slot."""
+        return self.slots[kind][day][index]
+
+    def slot_count(self, day, kind="lecture"):
+        return len(self.slots[kind][day])
+
+    def slot_index(self, day, start, kind="lecture"):
+        """Index of the slot starting at `start`, or None if it is not legal."""
+        return self.index[kind][day].get(start)
+
+    def next_free_slot(self, day, first, occupancy, kind="lecture", extra_busy=0):
+        """Index of the first slot >= `first` that is free in `occupancy`."""
+        day_slots = self.slots[kind][day]
+        if first >= len(day_slots):
+            return None
+        fits = fit_mask(occupancy.free_mask(extra_busy), self.durations[kind])
+        start = lowest_bit_from(
+            fits & self.start_masks[kind][day], day_slots[first][0]
+        )
+        if start is None:
+            return None
+        return self.index[kind][day][start]
+
+    def weekly_slots(self, kind="lecture"):
+        """Every (day, index) pair of the week in order."""
+        return [
+            (day, index)
+            for day in self.days
+            for index in range(len(self.slots[kind][day]))
+        ]
+
+    def label(self, day, index, kind="lecture"):
+        start, end = self.slots[kind][day][index]
+        return f"{day} {minutes_to_time(start)}-{minutes_to_time(end)}"
+
+    def consecutive(self, day, index, kind="lecture"):
+        """Check if slot `index` is followed by the next slot without a break."""
+        day_slots = self.slots[kind][day]
+        if index + 1 >= len(day_slots):
+            return False
+        end = day_slots[index][1]
+        gap = day_slots[index + 1][0] - end
+        return gap <= self.gap_between_lectures
+
+
+def build_slot_grid(class_config, break_config):
+    """Compile class and break configs into the legal slots of every day."""
+    breaks = parse_break_times(break_config)
+    gap_between_lectures = break_config["GAP_TIME_BETWEEN_LECTURES"]
+    class_end_time = time_to_minutes(class_config["END_TIME"])
+    lecture_slots = lecture_slot_times(class_config, breaks, gap_between_lectures)
+    lab_slots = lab_slot_times(
+        lecture_slots, class_config["LAB_DURATION"], breaks, class_end_time
+    )
+    days = class_config["DAYS"]
+    return SlotGrid(
+        days,
+        {
+            "lecture": {day: lecture_slots for day in days},
+            "lab": {day: lab_slots for day in days},
+        },
+        {
+            "lecture": class_config["LECTURE_DURATION"],
+            "lab": class_config["LAB_DURATION"],
+        },
+        gap_between_lectures,
+    )
@@ -1,4 +1,14 @@
+import argparse
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
 from ortools.sat.python import cp_model
+from config import load_config
+from constraint_spec import compile_masks, forbidden_times, load_constraints
+from slots import build_slot_grid
+from Lecture import Lecture
+from Scheduler import create_schedules
 
 # Sample Data
 departments = {
@@ -26,67 +36,7 @@ room_capacity = {
     'E204': 20,
     'E205': 15
 }
-class_times = ['9:00-10:00', '10:00-11:00', '11:00-12:00', '12:00-1:00']
-
-# Initialize the model
-model = cp_model.CpModel()
-
-# Create variables
-schedule = {}
-for dept, subs in subjects.items():
-    for sem in semesters:
-        for sub in subs:
-            for room in rooms['BlockA'] + rooms['BlockB']:
-                for time in class_times:
-                    schedule[(dept, sem, sub, room, time)] = model.NewBoolVar(f"{dept}_{sem}_{sub}_{room}_{time}")
-
-# Constraints
-# 1. No overlapping classes for the same department and semester
-for dept, subs in departments.items():
-    for sem in semesters:
-        for time in class_times:
-            model.AddAtMostOne(schedule[(dept, sem, sub, room, time)] 
-                              for sub in subjects[dept] 
-                              for room in rooms['BlockA'] + rooms['BlockB'])
-
-# 2. Room capacity constraints
-# (This requires knowing the number of students per class, which isn't provided in the sample data)
-# Placeholder: Ensure only one class per room per time slot
-for room in rooms['BlockA'] + rooms['BlockB']:
-    for time in class_times:
-        model.AddAtMostOne(schedule[(dept, sem, sub, room, time)] 
-                          for dept in departments 
-                          for sem in semesters 
-                          for sub in subjects[dept])
-
-# 3. Breathing gap constraints
-# Implemented by ensuring that if a class is scheduled at a certain time, 
-# the next time slot is available (this is a simplified version)
-for dept, subs in departments.items():
-    for sem in semesters:
-        for sub in subjects[dept]:
-            for room in rooms['BlockA'] + rooms['BlockB']:
-                for i in range(len(class_times) - 1):
-                    current_time = class_times[i]
-                    next_time = class_times[i + 1]
-                    model.Add(schedule[(dept, sem, sub, room, next_time)] <= 1 - schedule[(dept, sem, sub, room, current_time)])
-
-# 4. Proximity constraints
-# Simplified: Limit the number of different blocks used by a department in a semester
-for dept, subs in departments.items():
-    for sem in semesters:
-        blocks_used = []
-        for sub in subjects[dept]:
-            for room in rooms['BlockA'] + rooms['BlockB']:
-                block = 'A' if room in rooms['BlockA'] else 'B'
-                blocks_used.append(block)
-        # Ensure no more than 2 blocks are used
-        model.Add(sum(block == 'A' for block in blocks_used) <= 2)
-        model.Add(sum(block == 'B' for block in blocks_used) <= 2)
-
-# 5. Department room allocation constraints
-# Ensure classes are scheduled within the allocated rooms for each department
-# (Assuming departments have specific blocks; adjust as needed)
+# Departments only use rooms in their own blocks
 department_blocks = {
     'CSE': ['BlockA'],
     'EC': ['BlockA'],
@@ -96,25 +46,458 @@ department_blocks = {
     'Arts': ['BlockB'],
     'Science': ['BlockB']
 }
+# Sessions per week every subject needs in each semester
+subject_hours = {
+    'Math': 3,
+    'Programming': 3,
+    'Circuits': 3,
+    'Networking': 3,
+    'Fluid Mechanics': 3,
+    'Thermodynamics': 3,
+    'History': 3,
+    'Physics': 3
+}
+# Who teaches every subject, in all departments and semesters
+subject_professors = {
+    'Math': 'Dr. Shaun Murphy',
+    'Programming': 'Dr. Clair Brown',
+    'Circuits': 'Dr. Kalu Jared',
+    'Networking': 'Dr. Lim Audrey',
+    'Fluid Mechanics': 'Dr. Neil Melendez',
+    'Thermodynamics': 'Dr. Park Alex',
+    'History': 'Dr. Glassman Aaron',
+    'Physics': 'Dr. Andrews Marcus'
+}
+
+
+def sample_instance():
+    """The sample data above as one instance dictionary."""
+    return {
+        'departments': departments,
+        'semesters': semesters,
+        'subjects': subjects,
+        'rooms': rooms,
+        'room_capacity': room_capacity,
+        'department_blocks': department_blocks,
+        'subject_hours': subject_hours,
+        'subject_professors': subject_professors,
+    }
+
+
+def build_eligibility(instance):
+    """Rooms every department may use, from its allocated blocks."""
+    eligible_rooms = {}
+    for dept in instance['subjects']:
+        eligible_rooms[dept] = [
+            room
+            for block in instance['department_blocks'][dept]
+            for room in instance['rooms'][block]
+        ]
+    return eligible_rooms
+
+
+def build_model(instance, grid, constraints=None):
+    """Build the CP-SAT model with variables only for allowed combinations.
+
+    Variables are keyed by (dept, sem, subject, room, slot) where slot is an
+    index into grid.weekly_slots(). Slots ruled out by `constraints` (rules
+    from constraint_spec) get no variable at all. Returns the model, the
+    variables and the number of variables and constraints that were created.
+    """
+    model = cp_model.CpModel()
+    weekly_slots = grid.weekly_slots()
+    eligible_rooms = build_eligibility(instance)
+    forbidden = {}
+    if constraints:
+        forbidden = forbidden_times(compile_masks(constraints, grid.days), grid)
+    blocked = forbidden.get(('all', None), set())
+
+    # Create variables, indexed by every group a constraint needs
+    schedule = {}
+    by_section_time = defaultdict(list)
+    by_room_time = defaultdict(list)
+    by_professor_time = defaultdict(list)
+    by_course_time = defaultdict(list)
+    by_course = defaultdict(list)
+    by_course_day = defaultdict(list)
+    for dept, subs in instance['subjects'].items():
+        for sem in instance['semesters']:
+            for sub in subs:
+                professor = instance['subject_professors'][sub]
+                professor_away = forbidden.get(('professor', professor), set())
+                for room in eligible_rooms[dept]:
+                    room_away = forbidden.get(('room', room), set())
+                    for time in range(len(weekly_slots)):
+                        if time in blocked or time in professor_away or time in room_away:
+                            continue
+                        var = model.NewBoolVar(f"{dept}_{sem}_{sub}_{room}_{time}")
+                        schedule[(dept, sem, sub, room, time)] = var
+                        by_section_time[(dept, sem, time)].append(var)
+                        by_room_time[(room, time)].append(var)
+                        by_professor_time[(professor, time)].append(var)
+                        by_course_time[(dept, sem, sub, time)].append(var)
+                        by_course[(dept, sem, sub)].append(var)
+                        day = weekly_slots[time][0]
+                        by_course_day[(dept, sem, sub, day)].append(var)
+
+    # 1. No overlapping classes for the same department and semester
+    for section_vars in by_section_time.values():
+        if len(section_vars) > 1:
+            model.AddAtMostOne(section_vars)
+
+    # 2. Only one class per room per time slot
+    for room_vars in by_room_time.values():
+        if len(room_vars) > 1:
+            model.AddAtMostOne(room_vars)
+
+    # 3. A professor teaches one class at a time
+    for professor_vars in by_professor_time.values():
+        if len(professor_vars) > 1:
+            model.AddAtMostOne(professor_vars)
+
+    # 4. Breathing gap: a subject is not taught in two back to back slots
+    consecutive = [
+        time
+        for time, (day, index) in enumerate(weekly_slots)
+        if grid.consecutive(day, index)
+    ]
+    for (dept, sem, sub), _ in by_course.items():
+        for time in consecutive:
+            model.Add(
+                sum(by_course_time[(dept, sem, sub, time)])
+                + sum(by_course_time[(dept, sem, sub, time + 1)])
+                <= 1
+            )
+
+    # 5. Proximity and 6. department room allocation hold by construction:
+    # variables only exist for rooms in the department's own blocks
+
+    # 7. Every subject gets its weekly hours
+    for (dept, sem, sub), course_vars in by_course.items():
+        model.Add(sum(course_vars) == instance['subject_hours'][sub])
+
+    # Objective: spread every subject across the week by counting each
+    # session beyond the first on the same day
+    repeats = []
+    for key, day_vars in by_course_day.items():
+        repeat = model.NewIntVar(0, len(day_vars), f"repeat_{'_'.join(key)}")
+        model.Add(repeat >= sum(day_vars) - 1)
+        repeats.append(repeat)
+    model.Minimize(sum(repeats))
+
+    proto = model.Proto()
+    stats = {
+        'variables': len(proto.variables),
+        'constraints': len(proto.constraints),
+    }
+    return model, schedule, stats
+
+
+def instance_sections(instance):
+    """Turn every (dept, sem) of the instance into a list of greedy Lectures.
+
+    Each lecture gets a room of its department's blocks, handed out in turn
+    so the shared resource index keeps rooms from being double-booked.
+    """
+    eligible_rooms = build_eligibility(instance)
+    handed_out = defaultdict(int)
+    sections = {}
+    for dept, subs in instance['subjects'].items():
+        rooms_of_dept = eligible_rooms[dept]
+        for sem in instance['semesters']:
+            lectures = []
+            for sub in subs:
+                block = tuple(rooms_of_dept)
+                room = rooms_of_dept[handed_out[block] % len(rooms_of_dept)]
+                handed_out[block] += 1
+                lectures.append(
+                    Lecture(
+                        name=sub,
+                        corp=dept,
+                        credit=instance['subject_hours'][sub],
+                        professor=instance['subject_professors'][sub],
+                        hpw=instance['subject_hours'][sub],
+                        room=room,
+                    )
+                )
+            sections[(dept, sem)] = lectures
+    return sections
+
+
+def greedy_solution(instance, grid, class_config, break_config, constraints=None):
+    """Run the greedy Scheduler and map its placements onto model keys.
+
+    The two engines do not enforce the same rules: the greedy one allows
+    MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY back to back hours of a subject,
+    while the model forbids any (constraint 4). The later of two back to back
+    hours is left out so every hint respects the model. Hours the greedy
+    engine cannot place are simply not hinted.
+    """
+    schedules, _ = create_schedules(
+        instance_sections(instance),
+        class_config,
+        break_config,
+        constraints=constraints,
+        strict=False,
+    )
+    weekly_slots = grid.weekly_slots()
+    weekly_index = {slot: time for time, slot in enumerate(weekly_slots)}
+    keys = set()
+    taught = set()
+    for (dept, sem), schedule in schedules.items():
+        times = set()
+        for day, placements in schedule.items():
+            for placement in placements:
+                if placement.kind != "lecture":
+                    continue
+                index = grid.slot_index(day, placement.start)
+                if index is None:
+                    continue
+                times.add(
+                    (placement.course_name, placement.room_name, weekly_index[(day, index)])
+                )
+        for sub, room, time in sorted(times, key=lambda item: item[2]):
+            day, index = weekly_slots[time]
+            previous = (dept, sem, sub, time - 1)
+            if index and grid.consecutive(day, index - 1) and previous in taught:
+                continue  # Breathing gap
+            taught.add((dept, sem, sub, time))
+            keys.add((dept, sem, sub, room, time))
+    return keys
+
+
+def add_solution_hints(model, schedule, keys):
+    """Hint the solver towards the placements in `keys`.
+
+    Only those variables are hinted, so the solver is free to fill in the
+    hours the greedy engine left out. Keys with no variable (a slot ruled out
+    by the model) are skipped.
+    """
+    for key in keys:
+        if key in schedule:
+            model.AddHint(schedule[key], 1)
+
+
+class TimetableCallback(cp_model.CpSolverSolutionCallback):
+    """Hands every improved timetable to `on_solution` as soon as it is found."""
+
+    def __init__(self, schedule, on_solution):
+        super().__init__()
+        self.schedule = schedule
+        self.on_solution = on_solution
+        self.solutions = 0
+        self.best = None
+
+    def on_solution_callback(self):
+        self.solutions += 1
+        self.best = [key for key, var in self.schedule.items() if self.Value(var)]
+        self.on_solution(self.best, self.ObjectiveValue(), self.WallTime())
+
+
+def print_progress(timetable, objective, wall_time):
+    print(
+        f"Found timetable with {len(timetable)} classes, "
+        f"objective {objective:g} after {wall_time:.2f}s"
+    )
+
+
+def solve(model, schedule, workers=0, time_limit=None, on_solution=print_progress):
+    """Solve with parallel workers under an optional wall-clock budget.
+
+    `workers` = 0 lets CP-SAT use every core. `on_solution(timetable,
+    objective, wall_time)` is called for each improved timetable, so the best
+    one so far is available even when the budget runs out. Returns the solver
+    status and the best timetable as a list of variable keys (None if no
+    timetable was found).
+    """
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = workers
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    callback = TimetableCallback(schedule, on_solution or (lambda *args: None))
+    status = solver.Solve(model, callback)
+    return status, callback.best
+
+
+def split_instance(instance):
+    """Split the instance into parts that share no rooms and no professors.
+
+    Departments are grouped with a union-find over the blocks they use and the
+    professors who teach them. Every group becomes its own instance.
+    """
+    parent = {dept: dept for dept in instance['subjects']}
+
+    def find(dept):
+        while parent[dept] != dept:
+            parent[dept] = parent[parent[dept]]
+            dept = parent[dept]
+        return dept
+
+    owner = {}
+    for dept, subs in instance['subjects'].items():
+        resources = [
+            ('block', block) for block in instance['department_blocks'][dept]
+        ]
+        resources += [
+            ('professor', instance['subject_professors'][sub]) for sub in subs
+        ]
+        for resource in resources:
+            if resource in owner:
+                parent[find(dept)] = find(owner[resource])
+            else:
+                owner[resource] = dept
+
+    groups = defaultdict(list)
+    for dept in instance['subjects']:
+        groups[find(dept)].append(dept)
+
+    parts = []
+    for depts in groups.values():
+        part = dict(instance)
+        part['subjects'] = {dept: instance['subjects'][dept] for dept in depts}
+        part['department_blocks'] = {
+            dept: instance['department_blocks'][dept] for dept in depts
+        }
+        parts.append(part)
+    return parts
+
+
+def solve_part(part, class_config, break_config, workers, time_limit, constraints=None):
+    """Build and solve one part of a decomposed instance in a worker process."""
+    grid = build_slot_grid(class_config, break_config)
+    model, schedule, _ = build_model(part, grid, constraints)
+    status, timetable = solve(model, schedule, workers, time_limit, on_solution=None)
+    return status, timetable
+
+
+def find_shared_resources(timetable, instance):
+    """Classes that share a room, a professor or a section in the same slot."""
+    seen = {}
+    clashes = []
+    for key in timetable:
+        dept, sem, sub, room, time = key
+        professor = instance['subject_professors'][sub]
+        resources = (('room', room), ('professor', professor), ('section', dept, sem))
+        for resource in resources:
+            other = seen.setdefault((resource, time), key)
+            if other != key:
+                clashes.append((resource, time, other, key))
+    return clashes
+
+
+def solve_decomposed(
+    instance,
+    class_config,
+    break_config,
+    processes=None,
+    workers=1,
+    time_limit=None,
+    constraints=None,
+):
+    """Solve every independent part in a process pool and merge the results.
+
+    Returns the merged timetable (None if any part has no solution) and the
+    resource clashes found in it, which is empty when the split was sound.
+    """
+    parts = split_instance(instance)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(
+                solve_part,
+                part,
+                class_config,
+                break_config,
+                workers,
+                time_limit,
+                constraints,
+            )
+            for part in parts
+        ]
+        results = [future.result() for future in futures]
+
+    timetable = []
+    for _, part_timetable in results:
+        if part_timetable is None:
+            return None, []
+        timetable.extend(part_timetable)
+    return timetable, find_shared_resources(timetable, instance)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve the timetable with CP-SAT.")
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="start the solver from the greedy Scheduler's timetable",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="parallel search workers (0 uses every core)",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="wall-clock budget in seconds; the best timetable so far is kept",
+    )
+    parser.add_argument(
+        "--decompose",
+        action="store_true",
+        help="solve departments that share no rooms or professors in parallel",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="worker processes for --decompose (default: one per core)",
+    )
+    parser.add_argument(
+        "--constraints",
+        default="Constraints.txt",
+        help="constraint spec file (skipped if it does not exist)",
+    )
+    args = parser.parse_args()
+
+    class_config, break_config = load_config()
+    constraints = []
+    if os.path.exists(args.constraints):
+        constraints = load_constraints(args.constraints)
+    grid = build_slot_grid(class_config, break_config)
+    weekly_slots = grid.weekly_slots()
+    instance = sample_instance()
+
+    if args.decompose:
+        parts = split_instance(instance)
+        print(f"Solving {len(parts)} independent parts")
+        timetable, clashes = solve_decomposed(
+            instance,
+            class_config,
+            break_config,
+            args.processes,
+            max(args.workers, 1),
+            args.time_limit,
+            constraints,
+        )
+        for clash in clashes:
+            print(f"Shared {clash[0]} at {grid.label(*weekly_slots[clash[1]])}")
+    else:
+        model, schedule, stats = build_model(instance, grid, constraints)
+        print(f"Model has {stats['variables']} variables and {stats['constraints']} constraints")
+
+        if args.warm_start:
+            hints = greedy_solution(
+                instance, grid, class_config, break_config, constraints
+            )
+            add_solution_hints(model, schedule, hints)
+            print(f"Warm start with {len(hints)} greedy placements")
+
+        # Solve the model
+        status, timetable = solve(model, schedule, args.workers, args.time_limit)
 
-for dept, subs in subjects.items():
-    for sem in semesters:
-        for sub in subs:
-            for room in rooms['BlockA'] + rooms['BlockB']:
-                if room not in rooms[department_blocks[dept][0]]:
-                    for time in class_times:
-                        model.Add(schedule[(dept, sem, sub, room, time)] == 0)
-
-# Objective (optional): For example, minimize the total number of gaps
-# Here, no specific objective is set; it's a feasibility problem
-
-# Solve the model
-solver = cp_model.CpSolver()
-status = solver.Solve(model)
-
-if status == cp_model.FEASIBLE or status == cp_model.OPTIMAL:
-    for key, var in schedule.items():
-        if solver.Value(var) == 1:
-            print(f"{key[0]} - {key[1]} - {key[2]} in {key[3]} at {key[4]}")
-else:
-    print("No solution found.")
+    if timetable is None:
+        print("No solution found.")
+    else:
+        for key in sorted(timetable):
+            print(f"{key[0]} - {key[1]} - {key[2]} in {key[3]} at {grid.label(*weekly_slots[key[4]])}")
@@ -0,0 +1,100 @@
+import copy
+import json
+import os
+
+from conftest import ROOT
+from repair import repair_schedule, with_extra_breaks
+from Scheduler import create_schedule, sample_lectures
+from validator import validate_schedule
+
+
+def load_configs():
+    with open(os.path.join(ROOT, "class.config.json")) as f:
+        class_config = json.load(f)
+    with open(os.path.join(ROOT, "break.config.json")) as f:
+        break_config = json.load(f)
+    return class_config, break_config
+
+
+def lecture_hours(schedule, course_name):
+    return sum(
+        1
+        for placements in schedule.values()
+        for placement in placements
+        if placement.kind == "lecture" and placement.course_name == course_name
+    )
+
+
+def demo_lectures():
+    """The demo section less one course, so a changed schedule still fits."""
+    return [
+        lecture
+        for lecture in sample_lectures()
+        if lecture.course_name != "Software Engineering"
+    ]
+
+
+def repaired(changes):
+    """Repair a demo schedule and return it with its diff and violations."""
+    class_config, break_config = load_configs()
+    lectures = demo_lectures()
+    schedule = create_schedule(lectures, class_config, break_config, strict=False)
+    diff = repair_schedule(schedule, lectures, class_config, break_config, changes)
+    expected = copy.deepcopy(lectures)
+    for lecture in expected:
+        lecture.hpw = changes.get("hpw", {}).get(lecture.course_name, lecture.hpw)
+    violations = validate_schedule(
+        schedule,
+        class_config,
+        with_extra_breaks(break_config, changes.get("breaks", [])),
+        expected,
+    )
+    return lectures, schedule, diff, violations
+
+
+def test_several_hpw_changes_in_one_change_set():
+    hours = {lecture.course_name: lecture.hpw for lecture in demo_lectures()}
+    changes = {"hpw": {"Algorithms": 5, "Database Systems": 2}}
+
+    lectures, schedule, diff, violations = repaired(changes)
+
+    for course_name, hpw in changes["hpw"].items():
+        unplaced = sum(
+            1 for item in diff["unplaced"] if item["course"] == course_name
+        )
+        assert lecture_hours(schedule, course_name) + unplaced == hpw
+    assert violations == []
+    # The caller's lectures keep their hours
+    assert {lecture.course_name: lecture.hpw for lecture in lectures} == hours
+
+
+def test_hpw_change_drops_surplus_lectures():
+    changes = {"hpw": {"Algorithms": 1, "Database Systems": 1}}
+
+    _, schedule, diff, violations = repaired(changes)
+
+    assert lecture_hours(schedule, "Algorithms") == 1
+    assert lecture_hours(schedule, "Database Systems") == 1
+    assert not diff["added"]
+    assert violations == []
+
+
+def test_new_break_keeps_the_daily_limit():
+    _, _, diff, violations = repaired({"breaks": ["10:00-11:00"]})
+
+    assert not diff["unplaced"]
+    assert violations == []
+
+
+def test_unavailable_professors_keep_the_daily_limit():
+    changes = {
+        "unavailable": [
+            ("Dr. Shaun Murphy", "Monday", "08:00-13:05"),
+            ("Dr. Park Alex", "Tuesday", "08:00-13:05"),
+        ]
+    }
+
+    _, _, diff, violations = repaired(changes)
+
+    assert diff["moved"]
+    assert violations == []
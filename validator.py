@@ -0,0 +1,244 @@
+import argparse
+import json
+import sys
+
+from config import load_config, parse_break_times, time_to_minutes
+
+
+def violation(rule, day, section, detail, **extra):
+    return {"rule": rule, "day": day, "section": section, "detail": detail, **extra}
+
+
+def sweep_overlaps(intervals):
+    """Yield (earlier, later) for every interval that starts inside another.
+
+    `intervals` are (start, end, item) tuples. After sorting by start one pass
+    keeps the interval reaching furthest so far, so the whole check is
+    O(n log n).
+    """
+    reaching = None
+    for interval in sorted(intervals, key=lambda interval: interval[:2]):
+        if reaching is not None and interval[0] < reaching[1]:
+            yield reaching, interval
+        if reaching is None or interval[1] > reaching[1]:
+            reaching = interval
+
+
+def sweep_breaks(intervals, breaks):
+    """Yield (interval, break) for every interval that runs into a break.
+
+    Both lists are sorted and walked together; `breaks` are (start, end).
+    """
+    breaks = sorted(breaks)
+    first = 0
+    for interval in sorted(intervals, key=lambda interval: interval[:2]):
+        start, end = interval[0], interval[1]
+        # Breaks that end before this interval starts end before every later one
+        while first < len(breaks) and breaks[first][1] <= start:
+            first += 1
+        index = first
+        while index < len(breaks) and breaks[index][0] < end:
+            if breaks[index][1] > start:
+                yield interval, breaks[index]
+            index += 1
+
+
+def describe(section, placement):
+    return f"{placement.course_name} {placement.time}" + (
+        f" ({section})" if section is not None else ""
+    )
+
+
+def validate_schedules(schedules, class_config, break_config, sections=None):
+    """Check every hard constraint of finished schedules.
+
+    `schedules` maps a section name to its schedule and `sections`, when
+    given, maps it to its lectures so hours and labs per week are checked too.
+    Professors and rooms are checked across all sections. Returns a list of
+    violation dicts with rule, day, section and detail; an empty list means
+    the schedules are valid. Rules: section_overlap, professor_overlap,
+    room_overlap, break, unknown_day, day_bounds, lectures_per_day,
+    same_lecture_per_day, hours_per_week, labs_per_week, unknown_course.
+    """
+    days = class_config["DAYS"]
+    day_start = time_to_minutes(class_config["START_TIME"])
+    day_end = time_to_minutes(class_config["END_TIME"])
+    max_per_day = class_config["MAX_LECTURES_PER_DAY"]
+    max_same = class_config["MAX_SAME_LECTURE_COUNT_IN_SINGLE_DAY"]
+    breaks = parse_break_times(break_config)
+
+    violations = []
+    by_professor = {}
+    by_room = {}
+    for section, schedule in schedules.items():
+        hours = {}
+        labs = {}
+        for day, placements in schedule.items():
+            if day not in days:
+                violations.append(
+                    violation("unknown_day", day, section, f"{day} is not a class day")
+                )
+            intervals = []
+            same_day = {}
+            lectures_today = 0
+            for placement in placements:
+                if placement.kind == "break":
+                    continue
+                interval = (placement.start, placement.end, section, placement)
+                intervals.append(interval)
+                professor = placement.professor_name
+                if professor:
+                    by_professor.setdefault((professor, day), []).append(interval)
+                if placement.room is not None:
+                    by_room.setdefault((placement.room_name, day), []).append(interval)
+                if placement.start < day_start or placement.end > day_end:
+                    violations.append(
+                        violation(
+                            "day_bounds",
+                            day,
+                            section,
+                            f"{describe(section, placement)} is outside "
+                            f"{class_config['START_TIME']}-{class_config['END_TIME']}",
+                        )
+                    )
+                course_name = placement.course_name
+                if placement.kind == "lab":
+                    labs[course_name] = labs.get(course_name, 0) + 1
+                    continue
+                lectures_today += 1
+                same_day[course_name] = same_day.get(course_name, 0) + 1
+                hours[course_name] = hours.get(course_name, 0) + 1
+
+            for earlier, later in sweep_overlaps(intervals):
+                violations.append(
+                    violation(
+                        "section_overlap",
+                        day,
+                        section,
+                        f"{describe(None, earlier[3])} overlaps "
+                        f"{describe(None, later[3])}",
+                    )
+                )
+            for interval, (start, end) in sweep_breaks(intervals, breaks):
+                violations.append(
+                    violation(
+                        "break",
+                        day,
+                        section,
+                        f"{describe(None, interval[3])} runs into the break "
+                        f"{start // 60:02d}:{start % 60:02d}-"
+                        f"{end // 60:02d}:{end % 60:02d}",
+                    )
+                )
+            if lectures_today > max_per_day:
+                violations.append(
+                    violation(
+                        "lectures_per_day",
+                        day,
+                        section,
+                        f"{lectures_today} lectures, at most {max_per_day}",
+                    )
+                )
+            for course_name, count in same_day.items():
+                if count > max_same:
+                    violations.append(
+                        violation(
+                            "same_lecture_per_day",
+                            day,
+                            section,
+                            f"{course_name} {count} times, at most {max_same}",
+                            course=course_name,
+                        )
+                    )
+
+        if sections is not None and section in sections:
+            violations.extend(check_totals(section, sections[section], hours, labs))
+
+    for rule, groups in (("professor_overlap", by_professor), ("room_overlap", by_room)):
+        for (name, day), intervals in groups.items():
+            for earlier, later in sweep_overlaps(intervals):
+                violations.append(
+                    violation(
+                        rule,
+                        day,
+                        later[2],
+                        f"{name}: {describe(earlier[2], earlier[3])} overlaps "
+                        f"{describe(later[2], later[3])}",
+                        name=name,
+                    )
+                )
+    return violations
+
+
+def check_totals(section, lectures, hours, labs):
+    """Compare placed hours and labs with each lecture's hpw and labs per week."""
+    violations = []
+    expected = set()
+    for lecture in lectures:
+        course_name = lecture.course_name
+        expected.add(course_name)
+        placed = hours.get(course_name, 0)
+        if placed != lecture.hpw:
+            violations.append(
+                violation(
+                    "hours_per_week",
+                    None,
+                    section,
+                    f"{course_name} has {placed} hours, needs {lecture.hpw}",
+                    course=course_name,
+                )
+            )
+        labs_per_week = getattr(lecture, "labs_per_week", 0)
+        if labs.get(course_name, 0) != labs_per_week:
+            violations.append(
+                violation(
+                    "labs_per_week",
+                    None,
+                    section,
+                    f"{course_name} has {labs.get(course_name, 0)} labs, "
+                    f"needs {labs_per_week}",
+                    course=course_name,
+                )
+            )
+    for course_name in (hours.keys() | labs.keys()) - expected:
+        violations.append(
+            violation(
+                "unknown_course",
+                None,
+                section,
+                f"{course_name} is not in the lecture list",
+                course=course_name,
+            )
+        )
+    return violations
+
+
+def validate_schedule(schedule, class_config, break_config, lectures=None):
+    """validate_schedules() for a single section."""
+    return validate_schedules(
+        {None: schedule},
+        class_config,
+        break_config,
+        None if lectures is None else {None: lectures},
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check an exported schedule.")
+    parser.add_argument("schedule", help="schedule exported as .csv, .jsonl or .parquet")
+    args = parser.parse_args()
+
+    import exporters
+
+    if args.schedule.endswith(".parquet"):
+        loader = exporters.load_parquet
+    elif args.schedule.endswith(".jsonl"):
+        loader = exporters.load_jsonl
+    else:
+        loader = exporters.load_csv
+    class_config, break_config = load_config()
+    schedule = loader(args.schedule, class_config["DAYS"])
+    violations = validate_schedule(schedule, class_config, break_config)
+    for item in violations:
+        print(json.dumps(item))
+    sys.exit(1 if violations else 0)